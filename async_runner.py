@@ -0,0 +1,50 @@
+import asyncio
+import logging
+import threading
+
+# 使用 root logger
+logger = logging.getLogger(__name__)
+logger.propagate = True
+
+# 全程式共用一個背景事件迴圈，讓非同步 HTTP 連線池始終綁定在同一個迴圈上
+_loop = None
+_lock = threading.Lock()
+
+def get_loop():
+    """
+    取得背景事件迴圈，首次呼叫時於 daemon 執行緒中啟動
+    :return: asyncio 事件迴圈
+    """
+    global _loop
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="async-runner", daemon=True)
+            thread.start()
+            _loop = loop
+            logger.info("(async_runner) 背景事件迴圈已啟動")
+        return _loop
+
+def submit(coro):
+    """
+    將協程提交至背景事件迴圈
+    :param coro: 協程物件
+    :return: concurrent.futures.Future
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+def run(coro):
+    """
+    於背景事件迴圈執行協程，並在呼叫端執行緒同步等待結果
+    :param coro: 協程物件
+    :return: 協程的回傳值
+    """
+    loop = get_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("不可在背景事件迴圈內同步等待協程，請改用 await")
+    return submit(coro).result()
@@ -1,7 +1,16 @@
 import os
+import gc
+import functools
 import logging
+import mmap
+import shutil
 import time
+import glob
+import subprocess
 import tempfile
+import threading
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from pydub import AudioSegment
 from config import (
     OUTPUT_FOLDER,
@@ -10,6 +19,7 @@ from config import (
     SUPPORTED_FORMATS,
     MAX_FILE_SIZE,
     CHUNK_DURATION,
+    MAX_CONCURRENT_UPLOADS,
     SUMMARY_PROMPT
 )
 from openai_client import OpenAIClient
@@ -18,21 +28,180 @@ from openai_client import OpenAIClient
 logger = logging.getLogger(__name__)
 logger.propagate = True
 
+# Whisper API 可直接接受的容器格式，不需在本機轉檔
+WHISPER_NATIVE_FORMATS = frozenset({".flac", ".m4a", ".mp3", ".mp4", ".mpeg", ".mpga", ".oga", ".ogg", ".wav", ".webm"})
+
+# 音訊編碼對應可直接複製串流（-c:a copy）的容器
+CODEC_CONTAINERS = {
+    "aac": ".m4a",
+    "alac": ".m4a",
+    "mp3": ".mp3",
+    "opus": ".ogg",
+    "vorbis": ".ogg",
+    "flac": ".flac",
+    "pcm_s16le": ".wav",
+}
+
+@functools.lru_cache(maxsize=32)
+def _probe_cached(file_path, mtime_ns, size):
+    """
+    執行 ffprobe 並解析結果；mtime_ns 與 size 作為快取鍵的一部分，檔案變更後會重新探測
+    :return: 包含 duration_ms、bit_rate、codec_name、channels、sample_rate 的 dict（共用物件，請勿修改）
+    """
+    output = subprocess.check_output(
+        [
+            "ffprobe", "-v", "error",
+            "-select_streams", "a:0",
+            "-show_entries", "format=duration,bit_rate:stream=codec_name,channels,sample_rate",
+            "-of", "json",
+            file_path
+        ],
+        stderr=subprocess.DEVNULL
+    )
+    data = orjson.loads(output)
+    fmt = data.get("format", {})
+    stream = (data.get("streams") or [{}])[0]
+    return {
+        "duration_ms": int(float(fmt["duration"]) * 1000) if fmt.get("duration") else None,
+        "bit_rate": int(fmt["bit_rate"]) if fmt.get("bit_rate") else None,
+        "codec_name": stream.get("codec_name"),
+        "channels": stream.get("channels"),
+        "sample_rate": int(stream["sample_rate"]) if stream.get("sample_rate") else None,
+    }
+
+def _reencode_chunk(chunk_path, bitrate):
+    """
+    以較低位元率重新編碼單一片段（寫入暫存檔後取代原檔）
+    :param chunk_path: 片段路徑
+    :param bitrate: 目標位元率（kbps）
+    :return: 是否成功
+    """
+    tmp_path = chunk_path + ".tmp.mp3"
+    result = subprocess.run(
+        ["ffmpeg", "-y", "-i", chunk_path, "-ac", "1", "-b:a", f"{bitrate}k", "-c:a", "libmp3lame", tmp_path],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+    if result.returncode != 0:
+        logger.error("ffmpeg 重新編碼失敗：%s", result.stderr.decode("utf-8", errors="replace")[-500:])
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, chunk_path)
+    return True
+
+def probe_audio(file_path):
+    """
+    取得音訊檔案的中繼資料（同一檔案未變更前只會執行一次 ffprobe）
+    :param file_path: 音訊檔案路徑
+    :return: 包含 duration_ms、bit_rate、channels、sample_rate 的 dict，失敗時回傳 None
+    """
+    try:
+        st = os.stat(file_path)
+        return _probe_cached(os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+    except Exception as e:
+        logger.warning("無法取得音訊中繼資料：%s", e)
+        return None
+
+def prepare_for_upload(file_path, output_dir):
+    """
+    確保檔案為 Whisper API 可接受的格式。原生支援的容器直接使用原檔；
+    其他格式優先以 -c:a copy 換成對應的容器（不重新編碼），無法對應時才轉為 mp3。
+    :param file_path: 音訊檔案路徑
+    :param output_dir: 轉換後檔案的輸出資料夾
+    :return: 可上傳的檔案路徑，失敗時回傳 None
+    """
+    base_name, ext = os.path.splitext(os.path.basename(file_path))
+    if ext.lower() in WHISPER_NATIVE_FORMATS:
+        logger.info("檔案格式 %s 可直接上傳，略過轉檔", ext)
+        return file_path
+        
+    codec_name = (probe_audio(file_path) or {}).get("codec_name")
+    container = CODEC_CONTAINERS.get(codec_name)
+    if container:
+        output_path = os.path.join(output_dir, base_name + container)
+        result = subprocess.run(
+            ["ffmpeg", "-y", "-i", file_path, "-vn", "-c:a", "copy", output_path],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        if result.returncode == 0:
+            logger.info("已將 %s 串流（%s）複製至 %s 容器，未重新編碼", ext, codec_name, container)
+            return output_path
+        logger.warning("串流複製失敗，改為重新編碼：%s", file_path)
+        
+    output_path = os.path.join(output_dir, base_name + ".mp3")
+    result = subprocess.run(
+        ["ffmpeg", "-y", "-i", file_path, "-vn", "-ac", "1", "-b:a", "64k", "-c:a", "libmp3lame", output_path],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+    if result.returncode != 0:
+        logger.error("ffmpeg 轉檔失敗：%s", result.stderr.decode("utf-8", errors="replace")[-500:])
+        return None
+    logger.info("已將 %s（%s）重新編碼為 mp3", ext, codec_name or "未知編碼")
+    return output_path
+
+def _copy_segment(file_path, output_path, start, length):
+    """
+    以串流複製擷取一段音訊（不重新編碼）
+    :return: 是否成功
+    """
+    result = subprocess.run(
+        [
+            "ffmpeg", "-y", "-ss", str(start), "-t", str(length), "-i", file_path,
+            "-vn", "-c", "copy", output_path
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+    if result.returncode != 0:
+        logger.error("ffmpeg 擷取片段失敗：%s", result.stderr.decode("utf-8", errors="replace")[-500:])
+        return False
+    return True
+
+def split_with_overlap(file_path, output_dir, duration_ms, segment_seconds=300, overlap_seconds=5):
+    """
+    將長音訊切成前後重疊的片段，供並行轉錄；重疊部分避免句子在邊界被截斷
+    :param file_path: 音訊檔案路徑
+    :param output_dir: 片段輸出資料夾
+    :param duration_ms: 音訊長度（毫秒）
+    :param segment_seconds: 每段長度（秒）
+    :param overlap_seconds: 相鄰片段重疊的秒數
+    :return: 依時間排序的片段路徑列表，失敗時回傳空列表
+    """
+    base_name, ext = os.path.splitext(os.path.basename(file_path))
+    # 最後一段之後不足重疊秒數的尾端已涵蓋在前一段中，不另外切出過短的片段
+    starts = [ms // 1000 for ms in range(0, max(duration_ms - overlap_seconds * 1000, 1), segment_seconds * 1000)]
+    jobs = [
+        (os.path.join(output_dir, f"{base_name}_seg{i:03d}{ext}"), start)
+        for i, start in enumerate(starts)
+    ]
+    # 每個片段各自以 ffmpeg 串流複製，同時執行
+    with ThreadPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+        results = list(executor.map(
+            lambda job: _copy_segment(file_path, job[0], job[1], segment_seconds + overlap_seconds),
+            jobs
+        ))
+    if not all(results):
+        return []
+    logger.info("長音訊已切割為 %d 個重疊片段（每段 %d 秒，重疊 %d 秒）", len(jobs), segment_seconds, overlap_seconds)
+    return [path for path, _ in jobs]
+
 class AudioProcessor:
-    def __init__(self, supported_formats=None, max_file_size=None):
-        """初始化音訊處理器"""
+    def __init__(self, supported_formats=None, max_file_size=None, speech_client=None):
+        """
+        初始化音訊處理器
+        :param speech_client: 實作 SpeechClientBase 的轉錄客戶端，預設為 OpenAIClient
+        """
         self.supported_formats = supported_formats or SUPPORTED_FORMATS
         self.max_file_size = max_file_size or MAX_FILE_SIZE
         self.chunk_duration = CHUNK_DURATION
         self.output_folder = OUTPUT_FOLDER
         self.summary_folder = SUMMARY_FOLDER
         self.temp_folder = TEMP_FOLDER
-        self.openai_client = OpenAIClient()
-        
-        # 建立必要的資料夾
-        os.makedirs(self.temp_folder, exist_ok=True)
-        os.makedirs(self.output_folder, exist_ok=True)
-        os.makedirs(self.summary_folder, exist_ok=True)
+        self.speech_client = speech_client or OpenAIClient()
+        self._upload_semaphore = threading.BoundedSemaphore(MAX_CONCURRENT_UPLOADS)
 
         logger.info("(audio_processor) 音訊處理器初始化成功")
 
@@ -41,68 +210,71 @@ class AudioProcessor:
         try:
             logger.info("開始處理檔案：%s", file_path)
             
-            # 檢查檔案是否存在且可讀取
-            if not os.path.exists(file_path):
-                logger.error("檔案不存在：%s", file_path)
-                return False
-                
             # 檢查檔案格式
             file_ext = os.path.splitext(file_path)[1].lower()
             if file_ext not in self.supported_formats:
                 logger.error("不支援的檔案格式：%s", file_ext)
                 return False
                 
-            file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
+            # 檢查檔案是否存在且可讀取（只 stat 一次）
+            try:
+                file_size_mb = os.stat(file_path).st_size / (1024 * 1024)
+            except FileNotFoundError:
+                logger.error("檔案不存在：%s", file_path)
+                return False
             logger.info("檔案大小：%.2f MB", file_size_mb)
             
-            if file_size_mb > self.max_file_size:
+            # 本地轉錄等沒有上傳大小限制的後端不需要切割
+            if file_size_mb > self.max_file_size and self.speech_client.requires_chunking:
                 logger.info("檔案大小超過限制 (%.2f MB)，開始切割", self.max_file_size)
-                chunk_paths = self.split_audio_file(file_path)
+                # 只探測一次，將長度與位元率傳給切割流程
+                probe = self._probe(file_path) or {}
+                base_name = os.path.splitext(os.path.basename(file_path))[0]
+                transcript_path = os.path.join(self.output_folder, f"{base_name}_transcript.txt")
+                n_transcribed = 0
                 
-                if not chunk_paths:
-                    logger.error("切割檔案失敗")
-                    return False
+                # 片段存放於本次處理專用的暫存資料夾，離開 with 區塊時自動清理
+                with tempfile.TemporaryDirectory(prefix="atx_", dir=self.temp_folder) as chunk_dir:
+                    chunk_paths = self.split_audio_file(
+                        file_path,
+                        output_dir=chunk_dir,
+                        duration_ms=probe.get("duration_ms"),
+                        source_bitrate=probe.get("bit_rate")
+                    )
                     
-                transcripts = []
-                for i, chunk_path in enumerate(chunk_paths):
-                    try:
-                        logger.info("處理第 %d/%d 個片段", i+1, len(chunk_paths))
-                        chunk_size_mb = os.path.getsize(chunk_path) / (1024 * 1024)
-                        logger.info("片段大小：%.2f MB", chunk_size_mb)
+                    if not chunk_paths:
+                        logger.error("切割檔案失敗")
+                        return False
                         
-                        t_start = time.time()
-                        transcript = self.openai_client.transcribe_audio(chunk_path)
-                        t_end = time.time()
-                        
-                        if transcript:
-                            logger.info("片段轉錄成功，耗時：%.2f 秒", t_end - t_start)
-                            transcripts.append(transcript)
-                        else:
-                            logger.error("片段轉錄失敗")
-                    except Exception as e:
-                        logger.error("處理片段時發生錯誤：%s", e)
-                        continue
-                    finally:
-                        # 清理暫存檔案
-                        try:
-                            if os.path.exists(chunk_path):
-                                os.remove(chunk_path)
-                        except Exception as e:
-                            logger.error("清理暫存檔案失敗：%s", e)
+                    # 各片段為獨立的網路請求，平行上傳以縮短總耗時；
+                    # executor.map 依片段順序回傳，每完成一段即寫入逐字稿檔案，失敗時仍保留已完成的部分
+                    max_workers = min(8, len(chunk_paths))
+                    with open(transcript_path, "w", encoding="utf-8") as f, \
+                            ThreadPoolExecutor(max_workers=max_workers) as executor:
+                        for _, transcript in executor.map(
+                            lambda item: self._transcribe_one(item, len(chunk_paths)),
+                            enumerate(chunk_paths)
+                        ):
+                            if not transcript:
+                                continue
+                            if n_transcribed:
+                                f.write(" ")
+                            f.write(transcript)
+                            n_transcribed += 1
                         
-                if transcripts:
-                    merged_transcript = " ".join(transcripts)
-                    self.save_transcript(file_path, merged_transcript)
-                    self.generate_summary(merged_transcript, file_path)
+                if n_transcribed:
+                    logger.info("逐字稿已儲存至：%s", transcript_path)
+                    self.generate_summary(self._read_transcript(transcript_path), file_path)
                     logger.info("檔案處理完成")
                     return True
                 else:
+                    os.remove(transcript_path)
                     logger.error("所有片段轉錄均失敗")
                     return False
             else:
                 # 直接處理小檔案
                 t_start = time.time()
-                transcript = self.openai_client.transcribe_audio(file_path)
+                transcript = self.speech_client.transcribe_audio(file_path)
                 t_end = time.time()
                 
                 if transcript:
@@ -119,23 +291,54 @@ class AudioProcessor:
             logger.error("處理檔案時發生錯誤：%s", e)
             return False
 
-    def split_audio_file(self, file_path):
-        """切割音訊檔案為較小的片段"""
+    def _transcribe_one(self, item, total):
+        """
+        轉錄單一片段（於執行緒池中執行）
+        :param item: (片段索引, 片段路徑)
+        :param total: 片段總數
+        :return: (片段索引, 逐字稿)，失敗時逐字稿為 None
+        """
+        i, chunk_path = item
+        try:
+            logger.info("處理第 %d/%d 個片段", i+1, total)
+            
+            # 限制同時上傳數量，避免超過 API 的每分鐘請求數限制
+            with self._upload_semaphore:
+                t_start = time.time()
+                transcript = self.speech_client.transcribe_audio(chunk_path)
+                t_end = time.time()
+            
+            if transcript:
+                logger.info("片段 %d 轉錄成功，耗時：%.2f 秒", i+1, t_end - t_start)
+                return i, transcript
+            logger.error("片段 %d 轉錄失敗", i+1)
+            return i, None
+        except Exception as e:
+            logger.error("處理片段時發生錯誤：%s", e)
+            return i, None
+
+    def split_audio_file(self, file_path, output_dir, *, duration_ms=None, source_bitrate=None):
+        """
+        切割音訊檔案為較小的片段（以 ffmpeg segment muxer 串流切割，不將整個檔案載入記憶體）
+        :param file_path: 音訊檔案路徑
+        :param output_dir: 本次處理專用的片段輸出資料夾（由呼叫端建立與清理），不可與其他工作共用
+        :param duration_ms: 音訊長度（毫秒），未提供時以 ffprobe 取得
+        :param source_bitrate: 來源位元率（bps），未提供時以 ffprobe 取得
+        :return: 片段路徑列表，失敗時回傳空列表
+        """
         try:
             logger.info("開始切割檔案：%s", file_path)
             
-            # 載入音訊檔案
-            try:
-                audio = AudioSegment.from_file(file_path)
-            except Exception as e:
-                logger.error("載入音訊檔案失敗：%s", e)
-                return []
-                
+            if duration_ms is None and source_bitrate is None:
+                probe = self._probe(file_path) or {}
+                duration_ms = probe.get("duration_ms")
+                source_bitrate = probe.get("bit_rate")
+            
             # 計算切割參數
-            duration_ms = len(audio)
-            chunk_ms = self.chunk_duration * 60 * 1000  # 轉換為毫秒
-            n_chunks = (duration_ms + chunk_ms - 1) // chunk_ms
-            logger.info("音訊長度：%.2f 秒，將切割為 %d 個片段", duration_ms/1000, n_chunks)
+            chunk_seconds = self.chunk_duration * 60
+            if duration_ms:
+                n_chunks = (duration_ms + chunk_seconds * 1000 - 1) // (chunk_seconds * 1000)
+                logger.info("音訊長度：%.2f 秒，將切割為 %d 個片段", duration_ms/1000, n_chunks)
             
             # 使用原始檔案名稱作為前綴
             base_name = os.path.splitext(os.path.basename(file_path))[0]
@@ -145,66 +348,92 @@ class AudioProcessor:
             estimated_chunk_duration_min = self.chunk_duration
             bitrate = int((target_chunk_size_mb * 1024 * 8) / (estimated_chunk_duration_min * 60))  # kbps
             bitrate = max(32, min(192, bitrate))  # 限制在 32k-192k 之間
-            logger.info("使用位元率：%d kbps", bitrate)
             
+            # 來源已是 mp3 且位元率足以讓每段低於大小限制時，直接複製串流，不重新編碼
+            stream_copy = False
+            if os.path.splitext(file_path)[1].lower() == ".mp3" and source_bitrate:
+                estimated_chunk_mb = source_bitrate * chunk_seconds / 8 / (1024 * 1024)
+                stream_copy = estimated_chunk_mb < self.max_file_size
+                logger.info("來源位元率：%d kbps，預估每段 %.2f MB", source_bitrate // 1000, estimated_chunk_mb)
+            
+            # 固定位元率編碼的片段大小可由位元率推算，只有串流複製（來源可能為 VBR）
+            # 或推算結果接近上限時才需要逐一檢查實際檔案大小
+            if not stream_copy:
+                estimated_chunk_mb = bitrate * 1000 * chunk_seconds / 8 / (1024 * 1024)
+            check_sizes = stream_copy or estimated_chunk_mb > self.max_file_size * 0.9
+            
+            if stream_copy:
+                logger.info("使用串流複製切割，每段 %d 秒", chunk_seconds)
+                codec_args = ["-c", "copy"]
+            else:
+                logger.info("使用位元率：%d kbps，每段 %d 秒", bitrate, chunk_seconds)
+                codec_args = [
+                    "-ac", "1",  # 轉換為單聲道
+                    "-b:a", f"{bitrate}k",
+                    "-c:a", "libmp3lame"
+                ]
+            
+            # 單次 ffmpeg 呼叫完成切割（必要時一併編碼）
+            output_pattern = os.path.join(output_dir, f"{base_name}_part%03d.mp3")
+            result = subprocess.run(
+                [
+                    "ffmpeg", "-y", "-i", file_path,
+                    "-vn",  # 忽略封面圖片等影像串流
+                    "-f", "segment",
+                    "-segment_time", str(chunk_seconds),
+                    "-reset_timestamps", "1",
+                    *codec_args,
+                    output_pattern
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
+            )
+            if result.returncode != 0:
+                logger.error("ffmpeg 切割失敗：%s", result.stderr.decode("utf-8", errors="replace")[-500:])
+                return []
+                
             chunk_paths = []
-            for i in range(n_chunks):
+            oversized = []
+            pattern = os.path.join(glob.escape(output_dir), f"{glob.escape(base_name)}_part[0-9][0-9][0-9].mp3")
+            for i, chunk_path in enumerate(sorted(glob.glob(pattern))):
                 try:
-                    # 計算當前片段的起止時間
-                    start = i * chunk_ms
-                    end = min((i + 1) * chunk_ms, duration_ms)
-                    
-                    # 切割音訊
-                    chunk = audio[start:end]
-                    
-                    # 設定輸出路徑
-                    chunk_path = os.path.join(self.temp_folder, f"{base_name}_part{i+1}.mp3")
-                    
-                    # 導出為 mp3 格式
-                    chunk.export(
-                        chunk_path,
-                        format="mp3",
-                        bitrate=f"{bitrate}k",
-                        parameters=["-ac", "1"]  # 轉換為單聲道
-                    )
-                    
-                    # 檢查輸出檔案
-                    if os.path.exists(chunk_path):
-                        chunk_size_mb = os.path.getsize(chunk_path) / (1024 * 1024)
-                        logger.info("片段 %d 已輸出：%s (%.2f MB)", i+1, chunk_path, chunk_size_mb)
-                        
-                        # 如果檔案仍然太大，嘗試降低位元率
-                        if chunk_size_mb > self.max_file_size:
-                            logger.warning("片段 %d 仍然超過大小限制，嘗試降低位元率", i+1)
-                            os.remove(chunk_path)
-                            chunk.export(
-                                chunk_path,
-                                format="mp3",
-                                bitrate="32k",  # 使用最低位元率
-                                parameters=["-ac", "1"]
-                            )
-                            chunk_size_mb = os.path.getsize(chunk_path) / (1024 * 1024)
-                            logger.info("重新輸出片段 %d：%s (%.2f MB)", i+1, chunk_path, chunk_size_mb)
-                            
-                            if chunk_size_mb > self.max_file_size:
-                                logger.error("片段 %d 無法壓縮至符合大小限制", i+1)
-                                os.remove(chunk_path)
-                                continue
-                        
+                    if not check_sizes:
+                        logger.info("片段 %d 已輸出：%s", i+1, chunk_path)
                         chunk_paths.append(chunk_path)
-                    else:
-                        logger.error("片段 %d 輸出失敗", i+1)
+                        continue
+                        
+                    chunk_size_mb = os.path.getsize(chunk_path) / (1024 * 1024)
+                    logger.info("片段 %d 已輸出：%s (%.2f MB)", i+1, chunk_path, chunk_size_mb)
+                    
+                    # 如果檔案仍然太大，稍後統一降低位元率
+                    if chunk_size_mb > self.max_file_size:
+                        logger.warning("片段 %d 仍然超過大小限制，嘗試降低位元率", i+1)
+                        oversized.append((i, chunk_path))
+                    chunk_paths.append(chunk_path)
                         
                 except Exception as e:
                     logger.error("處理片段 %d 時發生錯誤：%s", i+1, e)
-                    # 清理失敗的檔案
-                    if os.path.exists(chunk_path):
-                        try:
-                            os.remove(chunk_path)
-                        except:
-                            pass
                     continue
                     
+            if oversized:
+                # 每個 ffmpeg 子行程各佔一個核心，同時重新編碼所有過大的片段
+                with ThreadPoolExecutor(max_workers=min(len(oversized), os.cpu_count() or 1)) as executor:
+                    reencoded = list(executor.map(
+                        lambda item: _reencode_chunk(item[1], 32),  # 使用最低位元率
+                        oversized
+                    ))
+                for (i, chunk_path), ok in zip(oversized, reencoded):
+                    if not ok:
+                        logger.error("片段 %d 重新編碼失敗", i+1)
+                        chunk_paths.remove(chunk_path)
+                        continue
+                    chunk_size_mb = os.path.getsize(chunk_path) / (1024 * 1024)
+                    logger.info("重新輸出片段 %d：%s (%.2f MB)", i+1, chunk_path, chunk_size_mb)
+                    
+                    if chunk_size_mb > self.max_file_size:
+                        logger.error("片段 %d 無法壓縮至符合大小限制", i+1)
+                        chunk_paths.remove(chunk_path)
+                    
             if chunk_paths:
                 logger.info("檔案切割完成，共 %d 個片段", len(chunk_paths))
                 return chunk_paths
@@ -216,6 +445,14 @@ class AudioProcessor:
             logger.error("切割檔案時發生錯誤：%s", e)
             return []
 
+    def _probe(self, file_path):
+        """
+        取得音訊檔案的中繼資料
+        :param file_path: 音訊檔案路徑
+        :return: 包含 duration_ms、bit_rate、channels、sample_rate 的 dict，失敗時回傳 None
+        """
+        return probe_audio(file_path)
+
     def save_transcript(self, file_path, transcript):
         """儲存轉錄結果"""
         try:
@@ -231,6 +468,16 @@ class AudioProcessor:
             logger.error("儲存逐字稿時發生錯誤：%s", e)
             return False
 
+    def _read_transcript(self, transcript_path):
+        """
+        透過 mmap 讀回逐字稿檔案，直接由映射的記憶體解碼，不另外建立 bytes 複本
+        :param transcript_path: 逐字稿檔案路徑
+        :return: 逐字稿文字
+        """
+        with open(transcript_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return str(mm, "utf-8")
+
     def generate_summary(self, transcript, file_path):
         """生成並儲存摘要"""
         try:
@@ -238,7 +485,7 @@ class AudioProcessor:
             output_path = os.path.join(self.summary_folder, f"{base_name}_summary.txt")
             
             # 只傳遞 transcript 參數
-            summary = self.openai_client.generate_summary(transcript)
+            summary = self.speech_client.generate_summary(transcript)
             if summary:
                 with open(output_path, "w", encoding="utf-8") as f:
                     f.write(summary)
@@ -251,12 +498,13 @@ class AudioProcessor:
             logger.error("生成摘要時發生錯誤：%s", e)
             return False
 
-    def split_audio(self, file_path, chunk_duration=600):
+    def split_audio(self, file_path, chunk_duration=600, *, output_dir):
         """
-        將音訊檔案分割成較小的片段
+        將音訊檔案分割成較小的片段（產生器，逐一輸出片段，避免同時持有所有片段）
         :param file_path: 音訊檔案路徑
         :param chunk_duration: 每個片段的長度（秒）
-        :return: 分割後的檔案路徑列表
+        :param output_dir: 片段輸出資料夾（由呼叫端建立），完成後以 cleanup_chunks(output_dir) 一次清理
+        :return: 逐一產生分割後檔案路徑的產生器
         """
         try:
             logger.info("(audio_processor) 開始分割音訊檔案：%s", file_path)
@@ -264,7 +512,14 @@ class AudioProcessor:
             # 檢查檔案是否存在
             if not os.path.exists(file_path):
                 logger.error("(audio_processor) 檔案不存在：%s", file_path)
-                return []
+                return
+                
+            # 先以 ffprobe 取得長度，短檔案不必解碼
+            probe = self._probe(file_path)
+            if probe and probe["duration_ms"] is not None and probe["duration_ms"] <= chunk_duration * 1000:
+                logger.info("(audio_processor) 檔案長度小於 %d 秒，無需分割", chunk_duration)
+                yield file_path
+                return
                 
             # 載入音訊檔案
             audio = AudioSegment.from_file(file_path)
@@ -273,32 +528,38 @@ class AudioProcessor:
             # 如果檔案長度小於 chunk_duration，直接返回原檔案
             if duration <= chunk_duration:
                 logger.info("(audio_processor) 檔案長度小於 %d 秒，無需分割", chunk_duration)
-                return [file_path]
+                yield file_path
+                return
                 
-            # 分割音訊
-            chunks = []
-            for i in range(0, len(audio), chunk_duration * 1000):
-                chunk = audio[i:i + chunk_duration * 1000]
-                chunk_path = os.path.join(tempfile.gettempdir(), f"chunk_{i}.mp3")
+            # 分割音訊：每次只建立一個片段，輸出後即釋放
+            base_name = os.path.splitext(os.path.basename(file_path))[0]
+            chunk_ms = chunk_duration * 1000
+            duration_ms = len(audio)
+            n_chunks = 0
+            for i in range(0, duration_ms, chunk_ms):
+                chunk = audio[i:i + chunk_ms]
+                if i + chunk_ms >= duration_ms:
+                    # 最後一個片段已切出，在交給呼叫端前先釋放完整音訊的 PCM 資料
+                    del audio
+                    gc.collect()
+                chunk_path = os.path.join(output_dir, f"{base_name}_chunk_{i}.mp3")
                 chunk.export(chunk_path, format="mp3")
-                chunks.append(chunk_path)
+                del chunk
+                n_chunks += 1
+                yield chunk_path
                 
-            logger.info("(audio_processor) 音訊檔案分割完成，共 %d 個片段", len(chunks))
-            return chunks
+            logger.info("(audio_processor) 音訊檔案分割完成，共 %d 個片段", n_chunks)
             
         except Exception as e:
             logger.error("(audio_processor) 分割音訊檔案時發生錯誤：%s", str(e))
-            return []
             
-    def cleanup_chunks(self, chunk_paths):
+    def cleanup_chunks(self, chunk_dir):
         """
-        清理分割後的音訊片段
-        :param chunk_paths: 音訊片段路徑列表
+        清理存放音訊片段的暫存資料夾
+        :param chunk_dir: 片段資料夾路徑（例如傳給 split_audio 的 output_dir）
         """
         try:
-            for path in chunk_paths:
-                if os.path.exists(path):
-                    os.remove(path)
-            logger.info("(audio_processor) 清理完成，共清理 %d 個檔案", len(chunk_paths))
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+            logger.info("(audio_processor) 清理完成：%s", chunk_dir)
         except Exception as e:
-            logger.error("(audio_processor) 清理檔案時發生錯誤：%s", str(e)) 
\ No newline at end of file
+            logger.error("(audio_processor) 清理檔案時發生錯誤：%s", str(e))
@@ -1,6 +1,8 @@
 # config.py 僅保留設定參數，不包含業務邏輯或 GUI 相關程式碼
 
 import os
+import functools
+from pathlib import Path
 from dotenv import load_dotenv
 
 # 載入 .env 檔案
@@ -14,11 +16,27 @@ WATCH_FOLDER = os.getenv("WATCH_FOLDER", "")  # 監控的資料夾路徑
 OUTPUT_FOLDER = os.getenv("OUTPUT_FOLDER", "transcripts")
 SUMMARY_FOLDER = os.getenv("SUMMARY_FOLDER", "summaries")
 TEMP_FOLDER = os.getenv("TEMP_FOLDER", "temp_chunks")
+CACHE_FOLDER = os.getenv("CACHE_FOLDER", ".cache")  # 轉錄與摘要快取
+LOG_FOLDER = "logs"  # 日誌
+
+@functools.lru_cache(maxsize=None)
+def _ensure_dirs(*paths):
+    """建立資料夾（相同參數只執行一次）"""
+    for p in paths:
+        Path(p).mkdir(parents=True, exist_ok=True)
+
+# 所有工作資料夾只在此於匯入時建立一次，唯讀檔案系統會在此直接失敗
+_ensure_dirs(OUTPUT_FOLDER, SUMMARY_FOLDER, TEMP_FOLDER, LOG_FOLDER)
 
 # 檔案處理設定
-SUPPORTED_FORMATS = os.getenv("SUPPORTED_FORMATS", ".mp3,.wav,.m4a,.flac").split(",")
+SUPPORTED_FORMATS = tuple(fmt.strip().lower() for fmt in os.getenv("SUPPORTED_FORMATS", ".mp3,.wav,.m4a,.flac").split(","))  # 正規化為小寫 tuple
 MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", "25"))  # 檔案大小限制（MB）
 CHUNK_DURATION = int(os.getenv("CHUNK_DURATION", "10"))  # 切割片段長度（分鐘）
+MAX_CONCURRENT_UPLOADS = int(os.getenv("MAX_CONCURRENT_UPLOADS", "4"))  # 同時上傳的片段數量上限
+
+# 轉錄後端設定
+SPEECH_BACKEND = os.getenv("SPEECH_BACKEND", "openai")  # openai 或 faster_whisper（本地轉錄）
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "large-v3")  # faster_whisper 使用的模型
 
 # 摘要生成設定
 SUMMARY_PROMPT = os.getenv("SUMMARY_PROMPT", """請根據以下逐字稿生成一份結構化的會議記錄，包含：
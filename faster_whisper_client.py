@@ -0,0 +1,73 @@
+import logging
+import time
+from speech_client_base import SpeechClientBase
+from config import WHISPER_MODEL
+
+# 使用 root logger
+logger = logging.getLogger(__name__)
+logger.propagate = True
+
+class FasterWhisperClient(SpeechClientBase):
+    # 本地推論沒有上傳大小限制，不需要切割檔案
+    requires_chunking = False
+
+    def __init__(self, model_size=None, summary_client=None):
+        """
+        初始化本地 Whisper 模型（faster-whisper）
+        :param model_size: 模型名稱，預設為 WHISPER_MODEL
+        :param summary_client: 負責生成摘要的客戶端（例如 OpenAIClient），本地模型不提供摘要功能
+        """
+        try:
+            import ctranslate2
+            from faster_whisper import WhisperModel
+        except ImportError:
+            logger.error("(faster_whisper_client) 未安裝 faster-whisper，請執行 pip install faster-whisper")
+            raise
+
+        try:
+            # 有 GPU 時使用 GPU，否則以 CPU int8 推論
+            device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+            compute_type = "int8_float16" if device == "cuda" else "int8"
+            model_size = model_size or WHISPER_MODEL
+            self.model = WhisperModel(model_size, device=device, compute_type=compute_type)
+            self.summary_client = summary_client
+            logger.info("(faster_whisper_client) 本地模型載入成功：%s (%s, %s)", model_size, device, compute_type)
+        except Exception as e:
+            logger.error("(faster_whisper_client) 本地模型載入失敗：%s", str(e))
+            raise
+
+    def transcribe_audio(self, file_path):
+        """
+        使用本地 Whisper 模型進行語音轉錄。
+        :param file_path: 音訊檔案路徑
+        :return: 逐字稿文字（str），失敗時回傳 None
+        """
+        try:
+            t_start = time.time()
+            logger.info("(faster_whisper_client) 開始本地轉錄檔案：%s", file_path)
+
+            segments, info = self.model.transcribe(file_path, language="zh", vad_filter=True)
+            # segments 為產生器，逐段解碼
+            transcript = " ".join(segment.text.strip() for segment in segments)
+
+            if not transcript:
+                logger.error("(faster_whisper_client) 轉錄結果為空")
+                return None
+
+            logger.info("(faster_whisper_client) 本地轉錄完成，音訊長度 %.2f 秒，耗時：%.2f 秒", info.duration, time.time() - t_start)
+            return transcript
+        except Exception as e:
+            logger.error("(faster_whisper_client) 轉錄過程發生錯誤：%s", str(e))
+            return None
+
+    def generate_summary(self, transcript, prompt=None):
+        """
+        交由 summary_client 生成摘要。
+        :param transcript: 逐字稿內容（str）
+        :param prompt: 摘要提示詞（str）
+        :return: 摘要文字（str），失敗時回傳 None
+        """
+        if self.summary_client is None:
+            logger.error("(faster_whisper_client) 未設定摘要客戶端，無法生成摘要")
+            return None
+        return self.summary_client.generate_summary(transcript, prompt)
@@ -2,25 +2,49 @@ import tkinter as tk
 from tkinter import filedialog, scrolledtext
 import logging
 import os
+import queue
 import threading
 from audio_processor import AudioProcessor
 
 class TextHandler(logging.Handler):
+    # 每隔多久（毫秒）將累積的日誌一次寫入文字元件
+    DRAIN_INTERVAL_MS = 50
+    
     def __init__(self, text_widget):
         logging.Handler.__init__(self)
         self.text_widget = text_widget
+        self._queue = queue.Queue()
+        self.text_widget.after(self.DRAIN_INTERVAL_MS, self._drain)
         
     def emit(self, record):
-        msg = self.format(record)
-        def append():
-            self.text_widget.configure(state='normal')
-            self.text_widget.insert(tk.END, msg + '\n')
-            self.text_widget.configure(state='disabled')
-            self.text_widget.yview(tk.END)
-        self.text_widget.after(0, append)
+        # 任何執行緒皆可呼叫，只放入佇列，由 Tk 主執行緒定期取出
+        self._queue.put(self.format(record))
+        
+    def _drain(self):
+        lines = []
+        while True:
+            try:
+                lines.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            if lines:
+                self.text_widget.configure(state='normal')
+                self.text_widget.insert(tk.END, '\n'.join(lines) + '\n')
+                self.text_widget.configure(state='disabled')
+                self.text_widget.yview(tk.END)
+            self.text_widget.after(self.DRAIN_INTERVAL_MS, self._drain)
+        except tk.TclError:
+            # 視窗已關閉
+            pass
 
 class TranscriptionGUI:
-    def __init__(self, openai_client, audio_processor):
+    def __init__(self, openai_client, audio_processor, process_file_func):
+        """
+        :param openai_client: 共用的 OpenAIClient
+        :param audio_processor: 音訊處理器
+        :param process_file_func: 處理單一檔案的同步函式 process_file(file_path, openai_client)
+        """
         self.root = tk.Tk()
         self.root.title("音訊轉錄工具")
         self.root.geometry("800x600")
@@ -28,6 +52,7 @@ class TranscriptionGUI:
         # 初始化處理器
         self.openai_client = openai_client
         self.audio_processor = audio_processor
+        self.process_file = process_file_func
         
         # 建立 GUI
         self.setup_gui()
@@ -39,8 +64,9 @@ class TranscriptionGUI:
         # 設定 GUI 文字處理器
         self.text_handler = TextHandler(self.log_text)
         self.text_handler.setFormatter(logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
+            '{asctime} - {levelname} - {message}',
+            datefmt='%Y-%m-%d %H:%M:%S',
+            style='{'
         ))
         self.logger.addHandler(self.text_handler)
         
@@ -91,9 +117,8 @@ class TranscriptionGUI:
     def process_file_in_thread(self):
         """在背景執行緒中處理檔案"""
         try:
-            from transcribe import process_file
             self.logger.info("(GUI) 已啟動背景執行緒，開始處理檔案")
-            success = process_file(self.file_path)
+            success = self.process_file(self.file_path, self.openai_client)
             if success:
                 self.logger.info("檔案處理完成")
             else:
@@ -7,7 +7,8 @@ def get_logger(name, log_file="transcribe.log", max_bytes=10*1024*1024, backup_c
     if logger.handlers:
         return logger
     logger.setLevel(level)
-    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+    formatter = logging.Formatter("{asctime} - {levelname} - {message}", style="{")
+    formatter.default_msec_format = None
     # 檔案輸出（log rotation）
     os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
     file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
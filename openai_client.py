@@ -1,25 +1,98 @@
 import os
+import base64
+import asyncio
+import functools
+import hashlib
 import logging
 import time
-from openai import OpenAI
+import httpx
+import orjson
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
 from openai.types.audio import Transcription
+from speech_client_base import SpeechClientBase
+from transcription_cache import TranscriptionCache
+import async_runner
+from rate_limiter import estimate_tokens, truncate_to_tokens
 
 # 使用 root logger
 logger = logging.getLogger(__name__)
 logger.propagate = True
 
-class OpenAIClient:
-    def __init__(self):
-        """初始化 OpenAI 客戶端"""
+# 摘要使用的模型
+SUMMARY_MODEL = "gpt-4o"  # 支援自動 prompt 前綴快取
+
+# 摘要的固定提示詞：每次呼叫都相同，放在訊息最前面，才能命中 OpenAI 的 prompt 前綴快取
+SUMMARY_SYSTEM_PROMPT = "你是一位專業的會議記錄員，負責將會議內容整理成摘要。請保持專業、客觀的態度。"
+REDUCE_SYSTEM_PROMPT = "你是一位專業的會議記錄員，負責將多個會議摘要整合成一個完整的摘要。"
+DEFAULT_SUMMARY_PROMPT = "請將以下會議內容整理成摘要，重點包含：\n1. 會議主題\n2. 重要討論事項\n3. 決議事項\n4. 後續行動項目"
+
+# 轉錄使用的模型
+TRANSCRIBE_MODEL = "whisper-1"
+
+# 語意快取使用的向量模型
+EMBEDDING_MODEL = "text-embedding-3-small"
+# 向量模型的輸入上限為 8192 tokens；中文常超過每字 1 token，估算值需保留餘裕
+EMBEDDING_MAX_TOKENS = 6000
+
+# 串流轉錄（Realtime API）設定
+REALTIME_URL = "wss://api.openai.com/v1/realtime?intent=transcription"
+REALTIME_TRANSCRIBE_MODEL = "gpt-4o-mini-transcribe"
+REALTIME_SAMPLE_RATE = 24000  # pcm16 單聲道
+REALTIME_FRAME_MS = 40  # 每次送出的音訊長度
+REALTIME_COMMIT_SECONDS = 60  # 每累積多少秒音訊提交一次轉錄
+
+# HTTP 連線池大小
+HTTP_MAX_CONNECTIONS = 20
+
+@functools.lru_cache(maxsize=None)
+def static_prompt(system_prompt, user_prompt):
+    """
+    組成摘要請求的固定前綴（system 訊息），同一組提示詞只組合一次，並記錄其雜湊以便確認前綴未被改動
+    :param system_prompt: 角色設定
+    :param user_prompt: 摘要提示詞
+    :return: system 訊息內容
+    """
+    prefix = f"{system_prompt}\n\n{user_prompt}"
+    logger.info(
+        "(openai_client) 摘要固定前綴 sha256=%s（%d 字）",
+        hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:16], len(prefix)
+    )
+    return prefix
+
+class OpenAIClient(SpeechClientBase):
+    def __init__(self, limiter=None):
+        """
+        初始化 OpenAI 客戶端
+        :param limiter: 所有非同步 API 呼叫共用的 RateLimiter（可選，未提供時不限流）
+        """
         try:
-            self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            # 同步與非同步呼叫各共用一個保持連線的連線池，平行上傳時不必重複 TLS 交握；
+            # 沿用 SDK 的預設 client（逾時、重新導向等設定），只調整連線池大小
+            limits = httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS)
+            self._http = DefaultHttpxClient(http2=True, limits=limits)
+            self._ahttp = DefaultAsyncHttpxClient(http2=True, limits=limits)
+            self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=self._http)
+            self.aclient = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=self._ahttp)
             if not self.client.api_key:
                 raise ValueError("OpenAI API Key 未設定")
+            self.cache = TranscriptionCache()
+            self.limiter = limiter
             logger.info("(openai_client) OpenAI 客戶端初始化成功")
         except Exception as e:
             logger.error("(openai_client) OpenAI 客戶端初始化失敗：%s", str(e))
             raise
         
+    async def _call(self, func, *args, tokens=0, **kwargs):
+        """
+        經過限流器呼叫單一 API 請求；每個實際送出的請求各自計入 RPM/TPM
+        :param func: API 協程函式
+        :param tokens: 本次請求預估使用的 token 數
+        :return: func 的回傳值
+        """
+        if self.limiter is None:
+            return await func(*args, **kwargs)
+        return await self.limiter.run(func, *args, tokens=tokens, **kwargs)
+        
     def transcribe_audio(self, file_path):
         """
         使用 OpenAI Whisper API 進行語音轉錄。
@@ -30,30 +103,81 @@ class OpenAIClient:
             t_start = time.time()
             logger.info("(openai_client) 開始呼叫 OpenAI Whisper API 轉錄檔案：%s (時間戳: %s)", file_path, t_start)
             
-            # 檢查檔案是否存在
-            if not os.path.exists(file_path):
-                logger.error("(openai_client) 檔案不存在：%s", file_path)
+            if not self._check_audio_file(file_path):
                 return None
                 
-            # 檢查檔案大小
-            file_size = os.path.getsize(file_path)
-            if file_size > 25 * 1024 * 1024:  # 25MB
-                logger.error("(openai_client) 檔案太大：%.2f MB，超過 25MB 限制", file_size / (1024 * 1024))
+            # 相同內容的音訊直接使用快取結果
+            cache_key = self.cache.file_key(file_path)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("(openai_client) 使用快取的逐字稿：%s，快取統計：%s", file_path, self.cache.stats())
+                return cached
+                
+            # 設定超時時間（秒）
+            timeout = 300  # 5分鐘
+            
+            try:
+                with open(file_path, "rb") as f:
+                    logger.info("(openai_client) 開始上傳檔案到 OpenAI API...")
+                    # 傳入 file object 時 SDK 不會先讀入記憶體，由 httpx 分段讀取上傳
+                    transcript = self.client.audio.transcriptions.create(
+                        model=TRANSCRIBE_MODEL,
+                        file=f,
+                        language="zh",
+                        response_format="text",  # 直接返回文字格式
+                        timeout=timeout  # 設定超時時間
+                    )
+                    
+                if not transcript:
+                    logger.error("(openai_client) API 返回空結果")
+                    return None
+                    
+                self._log_transcript(transcript, t_start)
+                self.cache.set(cache_key, transcript)
+                return transcript
+                
+            except Exception as api_error:
+                logger.error("(openai_client) API 呼叫失敗：%s", str(api_error))
+                if "timeout" in str(api_error).lower():
+                    logger.error("(openai_client) API 呼叫超時（超過 %d 秒）", timeout)
                 return None
+                
+        except Exception as e:
+            logger.error("(openai_client) 轉錄過程發生錯誤：%s", str(e))
+            return None
             
-            # 檢查 API Key
-            if not self.client.api_key:
-                logger.error("(openai_client) OpenAI API Key 未設定")
+    async def atranscribe_audio(self, file_path, file_hash=None):
+        """
+        非同步版本的 transcribe_audio，需於 async_runner 的背景事件迴圈中執行。
+        :param file_path: 音訊檔案路徑
+        :param file_hash: 呼叫端已計算的檔案內容雜湊（可選），提供時不再重新讀取整個檔案
+        :return: 逐字稿文字（str），失敗時回傳 None
+        """
+        try:
+            t_start = time.time()
+            logger.info("(openai_client) 開始呼叫 OpenAI Whisper API 轉錄檔案：%s (時間戳: %s)", file_path, t_start)
+            
+            loop = asyncio.get_running_loop()
+            if not await loop.run_in_executor(None, self._check_audio_file, file_path):
                 return None
                 
+            # 相同內容的音訊直接使用快取結果（雜湊計算與 SQLite 查詢在執行緒中進行，不阻塞事件迴圈）
+            cache_key = await loop.run_in_executor(None, self.cache.file_key, file_path, file_hash)
+            cached = await loop.run_in_executor(None, self.cache.get, cache_key)
+            if cached is not None:
+                logger.info("(openai_client) 使用快取的逐字稿：%s，快取統計：%s", file_path, self.cache.stats())
+                return cached
+                
             # 設定超時時間（秒）
             timeout = 300  # 5分鐘
             
             try:
                 with open(file_path, "rb") as f:
                     logger.info("(openai_client) 開始上傳檔案到 OpenAI API...")
-                    transcript = self.client.audio.transcriptions.create(
-                        model="whisper-1",
+                    # 傳入 file object 時 SDK 不會先讀入記憶體，由 httpx 分段讀取上傳
+                    transcript = await self._call(
+                        self.aclient.audio.transcriptions.create,
+                        model=TRANSCRIBE_MODEL,
                         file=f,
                         language="zh",
                         response_format="text",  # 直接返回文字格式
@@ -64,10 +188,8 @@ class OpenAIClient:
                     logger.error("(openai_client) API 返回空結果")
                     return None
                     
-                t_end = time.time()
-                duration = t_end - t_start
-                logger.info("(openai_client) OpenAI Whisper API 轉錄完成，耗時：%.2f 秒", duration)
-                logger.info("(openai_client) 逐字稿內容：%s", transcript)
+                self._log_transcript(transcript, t_start)
+                await loop.run_in_executor(None, self.cache.set, cache_key, transcript)
                 return transcript
                 
             except Exception as api_error:
@@ -80,88 +202,306 @@ class OpenAIClient:
             logger.error("(openai_client) 轉錄過程發生錯誤：%s", str(e))
             return None
             
+    async def atranscribe_audio_stream(self, file_path, on_delta=None):
+        """
+        以 Realtime WebSocket 串流轉錄：ffmpeg 邊解碼邊送出音訊，逐字稿隨提交的音訊陸續回傳，
+        不需等待整個檔案上傳完成。需於 async_runner 的背景事件迴圈中執行。
+        整個連線期間計為一個請求並佔用一個同時請求名額。
+        :param file_path: 音訊檔案路徑
+        :param on_delta: 收到部分逐字稿時的回呼（可選）
+        :return: 逐字稿文字（str），失敗時回傳 None
+        """
+        return await self._call(self._atranscribe_audio_stream, file_path, on_delta)
+        
+    async def _atranscribe_audio_stream(self, file_path, on_delta):
+        """atranscribe_audio_stream 的實作（不經過限流器）"""
+        try:
+            import websockets
+        except ImportError:
+            logger.error("(openai_client) 未安裝 websockets，無法使用串流轉錄")
+            return None
+            
+        t_start = time.time()
+        logger.info("(openai_client) 開始串流轉錄檔案：%s", file_path)
+        
+        # 轉為 Realtime API 要求的 24kHz 單聲道 pcm16，從 stdout 串流讀取
+        ffmpeg = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-v", "error", "-i", file_path,
+            "-f", "s16le", "-ac", "1", "-ar", str(REALTIME_SAMPLE_RATE), "-",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        frame_bytes = REALTIME_SAMPLE_RATE * 2 * REALTIME_FRAME_MS // 1000
+        frames_per_commit = REALTIME_COMMIT_SECONDS * 1000 // REALTIME_FRAME_MS
+        
+        item_order = []  # 依提交順序排列的 item_id
+        texts = {}  # item_id -> 逐字稿
+        state = {"commits_sent": 0, "commits_acked": 0, "sending_done": False}
+        
+        async def send_audio(ws):
+            frames = 0
+            while True:
+                data = await ffmpeg.stdout.read(frame_bytes)
+                if not data:
+                    break
+                await ws.send(orjson.dumps({
+                    "type": "input_audio_buffer.append",
+                    "audio": base64.b64encode(data).decode("ascii")
+                }).decode())
+                frames += 1
+                if frames % frames_per_commit == 0:
+                    state["commits_sent"] += 1
+                    await ws.send(orjson.dumps({"type": "input_audio_buffer.commit"}).decode())
+            if frames % frames_per_commit:
+                state["commits_sent"] += 1
+                await ws.send(orjson.dumps({"type": "input_audio_buffer.commit"}).decode())
+            state["sending_done"] = True
+            
+        def finished():
+            return (
+                state["sending_done"]
+                and state["commits_acked"] == state["commits_sent"]
+                and all(item_id in texts for item_id in item_order)
+            )
+            
+        try:
+            headers = {"Authorization": f"Bearer {self.client.api_key}", "OpenAI-Beta": "realtime=v1"}
+            async with websockets.connect(REALTIME_URL, additional_headers=headers, max_size=None) as ws:
+                # 關閉伺服器端斷句，由用戶端定期提交，才能確定何時收齊所有結果
+                await ws.send(orjson.dumps({
+                    "type": "transcription_session.update",
+                    "session": {
+                        "input_audio_format": "pcm16",
+                        "input_audio_transcription": {"model": REALTIME_TRANSCRIBE_MODEL, "language": "zh"},
+                        "turn_detection": None
+                    }
+                }).decode())
+                sender = asyncio.ensure_future(send_audio(ws))
+                try:
+                    while not finished():
+                        if sender.done() and sender.exception():
+                            raise sender.exception()
+                        event = orjson.loads(await asyncio.wait_for(ws.recv(), timeout=300))
+                        event_type = event.get("type")
+                        if event_type == "input_audio_buffer.committed":
+                            state["commits_acked"] += 1
+                            item_order.append(event["item_id"])
+                        elif event_type == "conversation.item.input_audio_transcription.delta":
+                            if on_delta:
+                                on_delta(event.get("delta", ""))
+                        elif event_type == "conversation.item.input_audio_transcription.completed":
+                            texts[event["item_id"]] = event.get("transcript", "")
+                        elif event_type == "conversation.item.input_audio_transcription.failed":
+                            logger.warning("(openai_client) 串流轉錄片段失敗：%s", event.get("error"))
+                            texts[event["item_id"]] = ""
+                        elif event_type == "error":
+                            error = event.get("error", {})
+                            if error.get("code") == "input_audio_buffer_commit_empty":
+                                # 最後一次提交時緩衝區沒有音訊
+                                state["commits_acked"] += 1
+                            else:
+                                raise RuntimeError(error.get("message", str(error)))
+                finally:
+                    sender.cancel()
+                    
+            # 音訊送完代表 ffmpeg 已關閉 stdout；解碼中途失敗時只送出了部分音訊，結果不完整
+            returncode = await ffmpeg.wait()
+            if returncode != 0:
+                logger.error("(openai_client) ffmpeg 解碼失敗（結束代碼 %d），捨棄不完整的串流轉錄結果：%s", returncode, file_path)
+                return None
+        except Exception as e:
+            logger.error("(openai_client) 串流轉錄失敗：%s", str(e))
+            return None
+        finally:
+            if ffmpeg.returncode is None:
+                ffmpeg.kill()
+            await ffmpeg.wait()
+            
+        transcript = " ".join(texts[item_id].strip() for item_id in item_order if texts[item_id].strip())
+        if not transcript:
+            logger.error("(openai_client) 串流轉錄結果為空")
+            return None
+        self._log_transcript(transcript, t_start)
+        return transcript
+        
+    def _check_audio_file(self, file_path):
+        """
+        檢查檔案是否可上傳至 Whisper API
+        :param file_path: 音訊檔案路徑
+        :return: 是否通過檢查
+        """
+        # 檢查檔案是否存在
+        if not os.path.exists(file_path):
+            logger.error("(openai_client) 檔案不存在：%s", file_path)
+            return False
+            
+        # 檢查檔案大小
+        file_size = os.path.getsize(file_path)
+        if file_size > 25 * 1024 * 1024:  # 25MB
+            logger.error("(openai_client) 檔案太大：%.2f MB，超過 25MB 限制", file_size / (1024 * 1024))
+            return False
+        
+        # 檢查 API Key
+        if not self.client.api_key:
+            logger.error("(openai_client) OpenAI API Key 未設定")
+            return False
+        return True
+        
+    def _log_transcript(self, transcript, t_start):
+        """記錄轉錄耗時與逐字稿摘要資訊"""
+        logger.info("(openai_client) OpenAI Whisper API 轉錄完成，耗時：%.2f 秒", time.time() - t_start)
+        logger.info("(openai_client) 轉錄完成，長度 %d 字，前 80 字：%s", len(transcript), transcript[:80].replace("\n", " "))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("(openai_client) 逐字稿內容：%s", transcript)
+            
+    async def aembed(self, text):
+        """
+        取得文字的向量表示，過長的文字只取開頭部分
+        :param text: 文字內容
+        :return: 向量（list[float]），失敗時回傳 None
+        """
+        try:
+            text = truncate_to_tokens(text, EMBEDDING_MAX_TOKENS)
+            response = await self._call(
+                self.aclient.embeddings.create, model=EMBEDDING_MODEL, input=text,
+                tokens=estimate_tokens(text)
+            )
+            return response.data[0].embedding
+        except Exception as e:
+            logger.error("(openai_client) 取得向量失敗：%s", str(e))
+            return None
+            
     def generate_summary(self, transcript, prompt=None):
         """使用 OpenAI GPT API 生成摘要
         :param transcript: 轉錄內容
         :param prompt: 摘要提示詞（可選）
         :return: 摘要文字，失敗時回傳 None
         """
+        return async_runner.run(self.agenerate_summary(transcript, prompt))
+        
+    async def agenerate_summary(self, transcript, prompt=None):
+        """
+        非同步版本的 generate_summary，需於 async_runner 的背景事件迴圈中執行。
+        :param transcript: 轉錄內容
+        :param prompt: 摘要提示詞（可選）
+        :return: 摘要文字，失敗時回傳 None
+        """
         if not transcript or not transcript.strip():
             logger.error("(openai_client) 無效的轉錄內容")
             return None
             
+        # 相同逐字稿與提示詞直接使用快取結果（雜湊整份逐字稿與 SQLite 查詢在執行緒中進行）
+        loop = asyncio.get_running_loop()
+        cache_key = await loop.run_in_executor(None, self.cache.text_key, transcript, prompt, SUMMARY_MODEL)
+        cached = await loop.run_in_executor(None, self.cache.get, cache_key)
+        if cached is not None:
+            logger.info("(openai_client) 使用快取的摘要，快取統計：%s", self.cache.stats())
+            return cached
+            
+        summary = await self._agenerate_summary(transcript, prompt)
+        if summary:
+            await loop.run_in_executor(None, self.cache.set, cache_key, summary)
+        return summary
+        
+    async def _summarize_segment(self, i, total, segment, system_prompt):
+        """
+        生成單一段落的摘要
+        :return: 摘要文字，失敗時回傳 None
+        """
+        logger.info("(openai_client) 處理第 %d/%d 段", i, total)
         try:
-            logger.info("(openai_client) 開始呼叫 OpenAI GPT-4 API 生成摘要")
+            response = await self._call(
+                self.aclient.chat.completions.create,
+                tokens=estimate_tokens(system_prompt) + estimate_tokens(segment) + 300,
+                model=SUMMARY_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": f"會議內容：\n{segment}"}
+                ],
+                temperature=0.7,
+                max_tokens=300  # 減少每段摘要的 token 數量
+            )
+            if response.choices[0].message.content:
+                logger.info("(openai_client) 第 %d 段摘要生成成功", i)
+                return response.choices[0].message.content
+            logger.warning("(openai_client) 第 %d 段摘要生成為空", i)
+            return None
+        except Exception as e:
+            logger.error("(openai_client) 第 %d 段摘要生成失敗：%s", i, str(e))
+            return None
+            
+    async def _summarize_segments(self, segments, system_prompt):
+        """
+        同時生成所有段落的摘要
+        :return: 依段落順序排列的摘要列表，失敗的段落為 None
+        """
+        results = await asyncio.gather(
+            *[self._summarize_segment(i, len(segments), segment, system_prompt)
+              for i, segment in enumerate(segments, 1)],
+            return_exceptions=True
+        )
+        return [None if isinstance(r, BaseException) else r for r in results]
+        
+    async def _agenerate_summary(self, transcript, prompt=None):
+        """呼叫 OpenAI GPT API 生成摘要（不經過快取）"""
+        try:
+            logger.info("(openai_client) 開始呼叫 OpenAI GPT-4o API 生成摘要")
             start_time = time.time()
             
-            # 使用預設提示詞或自定義提示詞
-            system_prompt = "你是一位專業的會議記錄員，負責將會議內容整理成摘要。請保持專業、客觀的態度。"
-            user_prompt = prompt or "請將以下會議內容整理成摘要，重點包含：\n1. 會議主題\n2. 重要討論事項\n3. 決議事項\n4. 後續行動項目"
+            # 使用預設提示詞或自定義提示詞；固定內容放在 system 訊息，逐字稿放在最後
+            user_prompt = prompt or DEFAULT_SUMMARY_PROMPT
+            system_prompt = static_prompt(SUMMARY_SYSTEM_PROMPT, user_prompt)
             
             # 如果轉錄內容太長，先進行分段
             if len(transcript) > 2000:  # 降低分段閾值
                 logger.info("(openai_client) 轉錄內容較長，進行分段處理")
                 # 將轉錄內容分成多段，每段約1000字
+                # 以 list 暫存各行，換段時才 join，避免字串重複串接
                 segments = []
-                current_segment = ""
+                current_lines = []
                 current_length = 0
                 
                 for line in transcript.split('\n'):
                     if current_length + len(line) > 1000:  # 降低每段長度
-                        segments.append(current_segment)
-                        current_segment = line + '\n'
+                        segments.append(''.join(current_lines))
+                        current_lines = [line, '\n']
                         current_length = len(line)
                     else:
-                        current_segment += line + '\n'
+                        current_lines.append(line)
+                        current_lines.append('\n')
                         current_length += len(line)
                 
-                if current_segment:
-                    segments.append(current_segment)
+                if current_lines:
+                    segments.append(''.join(current_lines))
                 
-                logger.info(f"(openai_client) 將內容分成 {len(segments)} 段進行處理")
+                logger.info("(openai_client) 將內容分成 %d 段進行處理", len(segments))
                 
                 # 對每個段落生成摘要
-                segment_summaries = []
-                for i, segment in enumerate(segments, 1):
-                    logger.info(f"(openai_client) 處理第 {i}/{len(segments)} 段")
-                    try:
-                        response = self.client.chat.completions.create(
-                            model="gpt-4",
-                            messages=[
-                                {"role": "system", "content": system_prompt},
-                                {"role": "user", "content": f"{user_prompt}\n\n會議內容：\n{segment}"}
-                            ],
-                            temperature=0.7,
-                            max_tokens=300  # 減少每段摘要的 token 數量
-                        )
-                        if response.choices[0].message.content:
-                            segment_summaries.append(response.choices[0].message.content)
-                            logger.info(f"(openai_client) 第 {i} 段摘要生成成功")
-                        else:
-                            logger.warning(f"(openai_client) 第 {i} 段摘要生成為空")
-                    except Exception as e:
-                        logger.error(f"(openai_client) 第 {i} 段摘要生成失敗：{str(e)}")
-                        continue
+                # 各段摘要彼此獨立，同時送出
+                results = await self._summarize_segments(segments, system_prompt)
+                segment_summaries = [summary for summary in results if summary]
                 
                 # 如果有分段摘要，再生成最終摘要
                 if segment_summaries:
                     combined_summaries = "\n\n".join(segment_summaries)
                     logger.info("(openai_client) 開始生成最終摘要")
                     try:
-                        response = self.client.chat.completions.create(
-                            model="gpt-4",
+                        response = await self._call(
+                            self.aclient.chat.completions.create,
+                            tokens=estimate_tokens(user_prompt) + estimate_tokens(combined_summaries) + 800,
+                            model=SUMMARY_MODEL,
                             messages=[
-                                {"role": "system", "content": "你是一位專業的會議記錄員，負責將多個會議摘要整合成一個完整的摘要。"},
-                                {"role": "user", "content": f"{user_prompt}\n\n摘要內容：\n{combined_summaries}"}
+                                {"role": "system", "content": static_prompt(REDUCE_SYSTEM_PROMPT, user_prompt)},
+                                {"role": "user", "content": f"摘要內容：\n{combined_summaries}"}
                             ],
                             temperature=0.7,
                             max_tokens=800  # 減少最終摘要的 token 數量
                         )
                         end_time = time.time()
-                        logger.info(f"(openai_client) 摘要生成完成，耗時 {end_time - start_time:.2f} 秒")
+                        logger.info("(openai_client) 摘要生成完成，耗時 %.2f 秒", end_time - start_time)
                         return response.choices[0].message.content
                     except Exception as e:
-                        logger.error(f"(openai_client) 最終摘要生成失敗：{str(e)}")
+                        logger.error("(openai_client) 最終摘要生成失敗：%s", str(e))
                         return None
                 else:
                     logger.error("(openai_client) 所有段落摘要生成失敗")
@@ -169,22 +509,24 @@ class OpenAIClient:
             else:
                 # 如果內容不長，直接生成摘要
                 try:
-                    response = self.client.chat.completions.create(
-                        model="gpt-4",
+                    response = await self._call(
+                        self.aclient.chat.completions.create,
+                        tokens=estimate_tokens(system_prompt) + estimate_tokens(transcript) + 800,
+                        model=SUMMARY_MODEL,
                         messages=[
                             {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": f"{user_prompt}\n\n會議內容：\n{transcript}"}
+                            {"role": "user", "content": f"會議內容：\n{transcript}"}
                         ],
                         temperature=0.7,
                         max_tokens=800  # 減少摘要的 token 數量
                     )
                     end_time = time.time()
-                    logger.info(f"(openai_client) 摘要生成完成，耗時 {end_time - start_time:.2f} 秒")
+                    logger.info("(openai_client) 摘要生成完成，耗時 %.2f 秒", end_time - start_time)
                     return response.choices[0].message.content
                 except Exception as e:
-                    logger.error(f"(openai_client) 摘要生成失敗：{str(e)}")
+                    logger.error("(openai_client) 摘要生成失敗：%s", str(e))
                     return None
                 
         except Exception as e:
-            logger.error(f"(openai_client) API 呼叫失敗：{str(e)}")
+            logger.error("(openai_client) API 呼叫失敗：%s", str(e))
             return None 
\ No newline at end of file
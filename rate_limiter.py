@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import time
+
+# 使用 root logger
+logger = logging.getLogger(__name__)
+logger.propagate = True
+
+def estimate_tokens(text):
+    """
+    粗略估計文字的 token 數：中文約每字 1 token（UTF-8 3 bytes），英文約每 3-4 字元 1 token
+    :param text: 文字內容
+    :return: 估計的 token 數
+    """
+    return len(text.encode("utf-8")) // 3 if text else 0
+
+def truncate_to_tokens(text, max_tokens):
+    """
+    依 estimate_tokens 的估算方式截斷文字，使估計的 token 數不超過上限
+    :param text: 文字內容
+    :param max_tokens: token 數上限
+    :return: 截斷後的文字
+    """
+    data = text.encode("utf-8")
+    if len(data) // 3 <= max_tokens:
+        return text
+    # 截斷處若落在多位元組字元中間，捨棄不完整的字元
+    return data[:max_tokens * 3].decode("utf-8", errors="ignore")
+
+class RateLimiter:
+    """
+    非同步 API 呼叫限流器：限制同時請求數、每分鐘請求數（RPM）與每分鐘 token 數（TPM）。
+    以 token bucket 在送出前預先節流，而不是等到 API 回傳 429 才重試。
+    數值小於等於 0 代表不限制。
+    """
+
+    def __init__(self, max_concurrent_requests, requests_per_minute, tokens_per_minute):
+        self.max_concurrent_requests = max_concurrent_requests
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._request_allowance = float(max(requests_per_minute, 0))
+        self._token_allowance = float(max(tokens_per_minute, 0))
+        # asyncio 物件需在事件迴圈中建立，於首次使用時初始化
+        self._semaphore = None
+        self._lock = None
+        self._last_refill = None
+
+    def _ensure_primitives(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests if self.max_concurrent_requests > 0 else 1 << 30)
+            self._lock = asyncio.Lock()
+            self._last_refill = time.monotonic()
+
+    def _refill(self):
+        """依經過時間補充額度"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if self.requests_per_minute > 0:
+            self._request_allowance = min(
+                self.requests_per_minute,
+                self._request_allowance + elapsed * self.requests_per_minute / 60
+            )
+        if self.tokens_per_minute > 0:
+            self._token_allowance = min(
+                self.tokens_per_minute,
+                self._token_allowance + elapsed * self.tokens_per_minute / 60
+            )
+
+    async def _acquire_budget(self, tokens):
+        """等待直到 RPM 與 TPM 額度足夠，並扣除本次用量"""
+        if self.tokens_per_minute > 0:
+            tokens = min(tokens, self.tokens_per_minute)  # 單次請求超過上限時，至多等待一個完整週期
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = 0.0
+                if self.requests_per_minute > 0 and self._request_allowance < 1:
+                    wait = max(wait, (1 - self._request_allowance) * 60 / self.requests_per_minute)
+                if self.tokens_per_minute > 0 and self._token_allowance < tokens:
+                    wait = max(wait, (tokens - self._token_allowance) * 60 / self.tokens_per_minute)
+                if wait <= 0:
+                    if self.requests_per_minute > 0:
+                        self._request_allowance -= 1
+                    if self.tokens_per_minute > 0:
+                        self._token_allowance -= tokens
+                    return
+                logger.info("(rate_limiter) 已達速率限制，等待 %.2f 秒", wait)
+                await asyncio.sleep(wait)
+
+    async def run(self, func, *args, tokens=0, **kwargs):
+        """
+        在限流下執行協程函式
+        :param func: 協程函式
+        :param tokens: 本次請求預估使用的 token 數
+        :return: func 的回傳值
+        """
+        self._ensure_primitives()
+        async with self._semaphore:
+            await self._acquire_budget(tokens)
+            return await func(*args, **kwargs)
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
 
 class SpeechClientBase(ABC):
+    # 是否受上傳大小限制，需要先將大檔案切割成片段
+    requires_chunking = True
+
     @abstractmethod
     def transcribe_audio(self, file_path):
         """
@@ -0,0 +1,23 @@
+import unittest
+from transcript_merge import merge_transcripts
+
+class MergeTranscriptsTest(unittest.TestCase):
+    def test_removes_overlap_at_boundary(self):
+        merged = merge_transcripts(["今天我們討論預算的問題，下一步是確認時程", "確認時程之後再開會決定"])
+        self.assertEqual(merged, "今天我們討論預算的問題，下一步是確認時程之後再開會決定")
+
+    def test_ignores_repeated_phrase_away_from_boundary(self):
+        tail = "好，我們可以先看第一季。接下來是人事的部分，下週請大家確認一下時間"
+        head = "確認一下時間，我們可以先看第一季的結果，再決定預算"
+        merged = merge_transcripts([tail, head])
+        self.assertEqual(merged, tail + "，我們可以先看第一季的結果，再決定預算")
+
+    def test_tolerates_cut_words_at_edges(self):
+        merged = merge_transcripts(["會議開始，先報告進度然後討", "告進度然後討論下一步"])
+        self.assertEqual(merged, "會議開始，先報告進度然後討論下一步")
+
+    def test_joins_with_space_without_overlap(self):
+        self.assertEqual(merge_transcripts(["第一段內容", "完全不同的第二段"]), "第一段內容 完全不同的第二段")
+
+if __name__ == "__main__":
+    unittest.main()
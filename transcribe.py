@@ -1,30 +1,68 @@
 import os
 import sys
+import queue
+import shutil
+import asyncio
+import tempfile
+import hashlib
+import functools
 import logging
+import threading
 import time
-from pathlib import Path
+from logging.handlers import QueueHandler, QueueListener
 from dotenv import load_dotenv
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from gui import TranscriptionGUI
-from openai_client import OpenAIClient
-from audio_processor import AudioProcessor
+from openai_client import (
+    OpenAIClient,
+    SUMMARY_MODEL,
+    SUMMARY_SYSTEM_PROMPT,
+    TRANSCRIBE_MODEL,
+    REALTIME_TRANSCRIBE_MODEL,
+    static_prompt
+)
+from audio_processor import AudioProcessor, probe_audio, prepare_for_upload, split_with_overlap
+from transcript_merge import merge_transcripts
+from config import (
+    SPEECH_BACKEND,
+    WHISPER_MODEL,
+    CACHE_FOLDER,
+    OUTPUT_FOLDER,
+    SUMMARY_FOLDER,
+    TEMP_FOLDER,
+    WATCH_FOLDER,
+    LOG_FOLDER,
+    SUPPORTED_FORMATS
+)
+import async_runner
+from rate_limiter import RateLimiter
+from transcription_cache import SemanticSummaryCache, hash_file
 
 # 載入 .env 檔案
 load_dotenv()
 
 # 設定 logging
 def setup_logging():
-    """設定日誌系統"""
-    # 建立 logs 資料夾
-    log_dir = "logs"
-    Path(log_dir).mkdir(parents=True, exist_ok=True)
+    """
+    設定日誌系統：各執行緒只將日誌放入佇列，由背景的 QueueListener 統一寫入檔案與控制台
+    :return: 已啟動的 QueueListener，程式結束前需呼叫 stop() 以寫出剩餘的日誌
+    """
+    # 已初始化過（例如本模組被重複匯入）時沿用既有的 listener，不另外啟動第二個
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers:
+        if isinstance(handler, QueueHandler) and getattr(handler, "listener", None):
+            return handler.listener
+            
+    # 設定日誌檔案路徑（資料夾於匯入 config 時建立）
+    log_file = os.path.join(LOG_FOLDER, "transcription.log")
     
-    # 設定日誌檔案路徑
-    log_file = os.path.join(log_dir, "transcription.log")
+    # 不記錄執行緒、行程資訊，省去每筆日誌的查詢
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
     
     # 設定根日誌記錄器
-    root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
     
     # 清除現有的處理器
@@ -35,21 +73,29 @@ def setup_logging():
     file_handler = logging.FileHandler(log_file, encoding='utf-8')
     file_handler.setLevel(logging.INFO)
     file_formatter = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
+        '{asctime} - {levelname} - {message}',
+        datefmt='%Y-%m-%d %H:%M:%S',
+        style='{'
     )
     file_handler.setFormatter(file_formatter)
-    root_logger.addHandler(file_handler)
     
     # 建立控制台處理器
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_formatter = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
+        '{asctime} - {levelname} - {message}',
+        datefmt='%Y-%m-%d %H:%M:%S',
+        style='{'
     )
     console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
+    
+    # 記錄日誌只需放入佇列，檔案與控制台的寫入不會阻塞 watchdog 與處理中的執行緒
+    log_queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    queue_handler.listener = listener
+    root_logger.addHandler(queue_handler)
+    listener.start()
     
     # 設定其他模組的日誌記錄器
     for logger_name in ['openai_client', 'audio_processor', 'gui']:
@@ -57,125 +103,423 @@ def setup_logging():
         module_logger.propagate = True  # 確保日誌傳播到根記錄器
     
     logging.info("日誌系統初始化完成，日誌檔案：%s", log_file)
+    return listener
+
+# 設定參數（資料夾路徑與支援格式統一由 config 提供）
+IGNORED_PREFIXES = (".", "~$")  # 隱藏檔、Office 暫存檔
+IGNORED_SUFFIXES = (".part", ".crdownload", ".tmp")  # 下載中或寫入中的暫存檔
+MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", "25")) * 1024 * 1024  # 25MB
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "5"))  # 同時送出的 API 請求數上限
+REQUESTS_PER_MINUTE = int(os.getenv("REQUESTS_PER_MINUTE", "50"))  # 每分鐘 API 請求數上限（0 為不限制）
+TOKENS_PER_MINUTE = int(os.getenv("TOKENS_PER_MINUTE", "30000"))  # 每分鐘摘要 token 數上限（0 為不限制）
+FILE_CACHE_FOLDER = os.path.join(CACHE_FOLDER, "files")  # 以檔案內容雜湊記錄已處理的輸出
+TRANSCRIBE_STREAMING = os.getenv("TRANSCRIBE_STREAMING", "false").lower() == "true"  # 使用 Realtime WebSocket 串流轉錄
+LONG_AUDIO_SEGMENT_SECONDS = int(os.getenv("LONG_AUDIO_SEGMENT_SECONDS", "300"))  # 超過此長度的音訊切段並行轉錄（秒）
+SEGMENT_OVERLAP_SECONDS = int(os.getenv("SEGMENT_OVERLAP_SECONDS", "5"))  # 相鄰片段重疊秒數
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD") or 0)  # 語意快取命中的最低相似度（未設定時停用）
+CLOSE_WAIT_SECONDS = 2.0  # 建立事件後等待關閉事件的秒數，逾時且大小未變則視為搬入的完整檔案
+PROCESSING_TTL = 3600  # 處理中標記的保留秒數，逾時視為已中斷
+PROCESS_CONCURRENCY = int(os.getenv("PROCESS_CONCURRENCY", "5"))  # 同時處理的檔案數量上限
+SUMMARY_PROMPT = os.getenv("SUMMARY_PROMPT", "請為以下會議逐字稿生成摘要，包含：\n1. 會議主題\n2. 主要討論內容\n3. 重要決議事項\n4. 後續行動項目")
 
 # 初始化日誌系統
-setup_logging()
+log_listener = setup_logging()
 logger = logging.getLogger(__name__)
 
-# 設定資料夾路徑
-OUTPUT_FOLDER = os.getenv("OUTPUT_FOLDER", "transcripts")
-SUMMARY_FOLDER = os.getenv("SUMMARY_FOLDER", "summaries")
-TEMP_FOLDER = os.getenv("TEMP_FOLDER", "temp")
-WATCH_FOLDER = os.getenv("WATCH_FOLDER", "")  # 監控資料夾路徑
-SUPPORTED_FORMATS = os.getenv("SUPPORTED_FORMATS", ".mp3,.wav,.m4a,.flac").split(",")
-MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", "25")) * 1024 * 1024  # 25MB
-SUMMARY_PROMPT = os.getenv("SUMMARY_PROMPT", "請為以下會議逐字稿生成摘要，包含：\n1. 會議主題\n2. 主要討論內容\n3. 重要決議事項\n4. 後續行動項目")
+# 啟動時即組合並記錄摘要固定前綴的雜湊，提示詞被改動時可從日誌看出前綴快取失效
+static_prompt(SUMMARY_SYSTEM_PROMPT, SUMMARY_PROMPT)
 
 class AudioFileHandler(FileSystemEventHandler):
-    def __init__(self, process_file_func):
+    def __init__(self, openai_client, process_file_func, closed_events=False):
+        """
+        :param openai_client: 共用的 OpenAIClient（保持連線池）
+        :param process_file_func: 處理單一檔案的協程函式，於背景事件迴圈中執行
+        :param closed_events: 觀察者是否會送出檔案關閉事件（Linux inotify），是則改由 on_closed 處理
+        """
+        self.openai_client = openai_client
         self.process_file = process_file_func
-        self.processing_files = set()
+        self.closed_events = closed_events
+        self.processing_files = {}  # 檔案路徑 -> 開始處理的時間
+        self._awaiting_close = {}  # 檔案路徑 -> (等待關閉事件的計時器, 上次檢查的檔案大小)
+        self._lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
         
+    @staticmethod
+    def _should_handle(file_path):
+        """
+        判斷是否為需要處理的音訊檔案，在做任何其他工作前先排除暫存檔等雜訊
+        :param file_path: 檔案路徑
+        :return: 是否需要處理
+        """
+        name = os.path.basename(file_path)
+        if name.startswith(IGNORED_PREFIXES):
+            return False
+        name = name.lower()
+        return name.endswith(SUPPORTED_FORMATS) and not name.endswith(IGNORED_SUFFIXES)
+        
+    def _try_mark(self, file_path):
+        """
+        標記檔案為處理中；檢查與標記於同一個鎖內完成，同時到達的重複事件只會有一個成功
+        :param file_path: 檔案路徑
+        :return: 是否標記成功（False 表示已在處理中）
+        """
+        now = time.monotonic()
+        with self._lock:
+            # 清除逾時的標記，避免處理流程異常中斷時殘留
+            expired = [path for path, started in self.processing_files.items() if now - started > PROCESSING_TTL]
+            for path in expired:
+                del self.processing_files[path]
+            if file_path in self.processing_files:
+                return False
+            self.processing_files[file_path] = now
+            return True
+            
+    def _unmark(self, file_path):
+        """移除處理標記"""
+        with self._lock:
+            self.processing_files.pop(file_path, None)
+            
+    @staticmethod
+    def _wait_until_stable(file_path, interval=0.1, timeout=5.0):
+        """
+        輪詢檔案大小直到不再變動，供不支援檔案關閉事件的平台判斷檔案是否寫入完成
+        :param file_path: 檔案路徑
+        :param interval: 輪詢間隔秒數
+        :param timeout: 最長等待秒數
+        :return: 最後取得的檔案大小
+        """
+        deadline = time.monotonic() + timeout
+        prev_size = -1
+        while True:
+            size = os.path.getsize(file_path)
+            if (size == prev_size and size > 0) or time.monotonic() >= deadline:
+                return size
+            prev_size = size
+            time.sleep(interval)
+            
     def on_created(self, event):
         if event.is_directory:
             return
+        if not self.closed_events:
+            self._handle(event.src_path, wait=True)
+            return
+        # 支援關閉事件時，等寫入端關閉檔案再由 on_closed 處理；
+        # 從其他位置搬入的檔案只有建立事件（IN_MOVED_TO）而沒有關閉事件，逾時後自行處理
+        if self._should_handle(event.src_path):
+            self._await_close(event.src_path, -1)
             
-        file_path = event.src_path
-        if not any(file_path.lower().endswith(fmt) for fmt in SUPPORTED_FORMATS):
+    def _await_close(self, file_path, last_size):
+        """啟動計時器等待檔案關閉事件"""
+        timer = threading.Timer(CLOSE_WAIT_SECONDS, self._on_close_timeout, (file_path,))
+        timer.daemon = True
+        with self._lock:
+            previous = self._awaiting_close.get(file_path)
+            if previous:
+                previous[0].cancel()
+            self._awaiting_close[file_path] = (timer, last_size)
+        timer.start()
+        
+    def _on_close_timeout(self, file_path):
+        """等待逾時仍未收到關閉事件：大小仍在變動則繼續等待，否則視為完整檔案開始處理"""
+        with self._lock:
+            entry = self._awaiting_close.pop(file_path, None)
+        if entry is None:
+            return
+        try:
+            size = os.stat(file_path).st_size
+        except OSError:
+            return
+        if size != entry[1]:
+            self._await_close(file_path, size)
+            return
+        self._handle(file_path, wait=True)
+        
+    def on_closed(self, event):
+        # 寫入端已關閉檔案，不需等待
+        if event.is_directory:
+            return
+        with self._lock:
+            entry = self._awaiting_close.pop(event.src_path, None)
+        if entry:
+            entry[0].cancel()
+        self._handle(event.src_path, wait=False)
+        
+    def on_moved(self, event):
+        # 在資料夾內改名（例如下載完成後 .crdownload 改為 .mp3）時檔案已完整，不需等待
+        if event.is_directory:
+            return
+        if os.path.dirname(os.path.abspath(event.dest_path)) != os.path.abspath(WATCH_FOLDER):
+            return
+        self._handle(event.dest_path, wait=False)
+        
+    def _handle(self, file_path, wait):
+        """
+        檢查並提交檔案處理
+        :param file_path: 檔案路徑
+        :param wait: 是否先輪詢等待檔案寫入完成
+        """
+        if not self._should_handle(file_path):
             return
             
-        # 避免重複處理
-        if file_path in self.processing_files:
+        # 標記檔案正在處理，避免重複處理
+        if not self._try_mark(file_path):
             return
             
         try:
-            # 等待檔案完全寫入
-            time.sleep(1)
-            
             # 檢查檔案大小
-            if os.path.getsize(file_path) == 0:
+            file_size = self._wait_until_stable(file_path) if wait else os.stat(file_path).st_size
+            if file_size == 0:
                 self.logger.warning("檔案大小為 0，跳過處理：%s", file_path)
+                self._unmark(file_path)
                 return
                 
-            # 標記檔案正在處理
-            self.processing_files.add(file_path)
             self.logger.info("開始處理檔案：%s", file_path)
             
-            # 處理檔案
-            success = self.process_file(file_path)
-            if success:
+            # 提交至背景事件迴圈處理，watchdog 執行緒立即返回以接收下一個事件
+            future = async_runner.submit(self.process_file(file_path, self.openai_client, size=file_size))
+            future.add_done_callback(functools.partial(self._on_processed, file_path))
+                
+        except Exception as e:
+            self.logger.error("處理檔案時發生錯誤：%s - %s", file_path, str(e))
+            # 移除處理標記
+            self._unmark(file_path)
+            
+    def _on_processed(self, file_path, future):
+        """檔案處理結束時的回呼"""
+        try:
+            if future.result():
                 self.logger.info("檔案處理完成：%s", file_path)
             else:
                 self.logger.error("檔案處理失敗：%s", file_path)
-                
         except Exception as e:
             self.logger.error("處理檔案時發生錯誤：%s - %s", file_path, str(e))
         finally:
             # 移除處理標記
-            self.processing_files.discard(file_path)
+            self._unmark(file_path)
+
+# 限制同時處理的檔案數量；於背景事件迴圈中首次使用時建立
+_process_semaphore = None
+
+# 內容相近的逐字稿（例如重新匯出的同一場會議）直接沿用既有摘要；
+# 例行會議的逐字稿也可能相似度很高，因此須明確設定門檻才啟用
+semantic_cache = SemanticSummaryCache(SUMMARY_PROMPT + SUMMARY_MODEL, SEMANTIC_CACHE_THRESHOLD) if SEMANTIC_CACHE_THRESHOLD else None
+
+async def _to_thread(func, *args):
+    """在執行緒中執行阻塞的函式，避免卡住事件迴圈"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args))
+
+def _write_text(path, text):
+    """寫入文字檔"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def _read_text(path):
+    """讀取文字檔"""
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+@functools.lru_cache(maxsize=None)
+def _file_cache_version(local_backend):
+    """
+    檔案快取的版本鍵：摘要提示詞、摘要模型或轉錄後端與模型改變後，舊的快取項目不會被命中
+    :param local_backend: 是否使用本地轉錄後端
+    :return: 版本雜湊字串
+    """
+    if local_backend:
+        backend = f"faster_whisper:{WHISPER_MODEL}"
+    elif TRANSCRIBE_STREAMING:
+        backend = f"realtime:{REALTIME_TRANSCRIBE_MODEL}"
+    else:
+        backend = f"openai:{TRANSCRIBE_MODEL}"
+    version_key = "\0".join((SUMMARY_SYSTEM_PROMPT, SUMMARY_PROMPT, SUMMARY_MODEL, backend))
+    return hashlib.sha256(version_key.encode("utf-8")).hexdigest()[:16]
+
+def _file_cache_paths(file_hash, version):
+    """
+    取得檔案快取中逐字稿與摘要副本的路徑（以內容雜湊與版本鍵命名，不受使用者輸出檔被覆寫影響）
+    :param file_hash: 音訊檔案內容雜湊
+    :param version: 版本鍵（見 _file_cache_version）
+    :return: (逐字稿副本路徑, 摘要副本路徑)
+    """
+    return (
+        os.path.join(FILE_CACHE_FOLDER, f"{file_hash}_{version}_transcript.txt"),
+        os.path.join(FILE_CACHE_FOLDER, f"{file_hash}_{version}_summary.txt"),
+    )
+
+def _restore_from_file_cache(file_hash, version, file_name):
+    """
+    若相同內容的音訊已以相同設定處理過，將快取中的逐字稿與摘要副本複製為本次的輸出
+    :param file_hash: 音訊檔案內容雜湊
+    :param version: 版本鍵（見 _file_cache_version）
+    :param file_name: 本次輸出使用的檔名（不含副檔名）
+    :return: 是否命中
+    """
+    cached_transcript, cached_summary = _file_cache_paths(file_hash, version)
+    # 摘要副本最後寫入，存在即代表此筆快取完整
+    if not (os.path.exists(cached_summary) and os.path.exists(cached_transcript)):
+        return False
+    shutil.copyfile(cached_transcript, os.path.join(OUTPUT_FOLDER, f"{file_name}_transcript.txt"))
+    shutil.copyfile(cached_summary, os.path.join(SUMMARY_FOLDER, f"{file_name}_summary.txt"))
+    return True
 
-def ensure_folders():
-    """確保必要的資料夾存在"""
-    for folder in [OUTPUT_FOLDER, SUMMARY_FOLDER, TEMP_FOLDER]:
-        Path(folder).mkdir(parents=True, exist_ok=True)
-    logger.info("資料夾初始化完成")
+def _register_file_cache(file_hash, version, transcript_path, summary_path):
+    """
+    將本次的逐字稿與摘要複製一份存入檔案快取
+    :param file_hash: 音訊檔案內容雜湊
+    :param version: 版本鍵（見 _file_cache_version）
+    :return: 摘要副本路徑
+    """
+    os.makedirs(FILE_CACHE_FOLDER, exist_ok=True)
+    cache_paths = _file_cache_paths(file_hash, version)
+    for src, dst in zip((transcript_path, summary_path), cache_paths):
+        tmp_path = dst + ".tmp"
+        shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+    return cache_paths[1]
 
-def process_file(file_path):
+async def _transcribe_file(openai_client, file_path, file_hash=None):
     """
-    處理單一音訊檔案
+    轉錄單一檔案：非 Whisper 原生格式先換成可上傳的容器；
+    長音訊切成重疊片段後並行轉錄再合併，單一長檔的轉錄時間約隨片段數縮短
+    :param openai_client: 共用的 OpenAIClient
     :param file_path: 音訊檔案路徑
-    :return: 是否成功處理
+    :param file_hash: 原始檔案的內容雜湊（可選），整檔上傳原始檔案時沿用，不再重新計算
+    :return: 逐字稿文字，失敗時回傳 None
     """
+    work_dir = await _to_thread(tempfile.mkdtemp, None, "atx_", TEMP_FOLDER)
     try:
-        logger.info("開始處理檔案：%s", file_path)
-        
-        # 檢查檔案大小
-        file_size = os.path.getsize(file_path)
-        logger.info("檔案大小：%.2f MB", file_size / (1024 * 1024))
-        
-        if file_size > MAX_FILE_SIZE:
-            logger.error("檔案太大：%.2f MB，超過限制", file_size / (1024 * 1024))
-            return False
+        upload_path = await _to_thread(prepare_for_upload, file_path, work_dir)
+        if not upload_path:
+            return None
+        # 轉檔後內容不同，雜湊需重新計算
+        if upload_path != file_path:
+            file_path, file_hash = upload_path, None
             
-        # 初始化客戶端
-        openai_client = OpenAIClient()
-        
-        # 轉錄音訊
-        transcript = openai_client.transcribe_audio(file_path)
-        if not transcript:
-            logger.error("轉錄失敗")
-            return False
+        probe = await _to_thread(probe_audio, file_path) or {}
+        duration_ms = probe.get("duration_ms")
+        if not duration_ms or duration_ms <= LONG_AUDIO_SEGMENT_SECONDS * 1000:
+            return await openai_client.atranscribe_audio(file_path, file_hash)
             
-        # 儲存逐字稿
-        file_name = os.path.splitext(os.path.basename(file_path))[0]
-        transcript_path = os.path.join(OUTPUT_FOLDER, f"{file_name}_transcript.txt")
-        with open(transcript_path, "w", encoding="utf-8") as f:
-            f.write(transcript)
-        logger.info("逐字稿已儲存至：%s", transcript_path)
+        segments = await _to_thread(
+            split_with_overlap, file_path, work_dir, duration_ms,
+            LONG_AUDIO_SEGMENT_SECONDS, SEGMENT_OVERLAP_SECONDS
+        )
+        if not segments:
+            logger.warning("切割長音訊失敗，改為整檔轉錄：%s", file_path)
+            return await openai_client.atranscribe_audio(file_path, file_hash)
+        texts = await asyncio.gather(*(openai_client.atranscribe_audio(path) for path in segments))
+        if not all(texts):
+            logger.error("部分片段轉錄失敗：%s", file_path)
+            return None
+        return merge_transcripts(texts)
+    finally:
+        await _to_thread(shutil.rmtree, work_dir, True)
+
+def process_file(file_path, openai_client, size=None, speech_client=None):
+    """
+    處理單一音訊檔案（同步介面，供 GUI 等非事件迴圈執行緒呼叫）
+    :param file_path: 音訊檔案路徑
+    :param openai_client: 共用的 OpenAIClient
+    :param size: 已知的檔案大小（bytes），未提供時自行取得
+    :param speech_client: 轉錄後端，未提供時使用 openai_client
+    :return: 是否成功處理
+    """
+    return async_runner.run(process_file_async(file_path, openai_client, size=size, speech_client=speech_client))
+
+async def process_file_async(file_path, openai_client, size=None, speech_client=None):
+    """
+    處理單一音訊檔案，多個檔案可於同一個事件迴圈中同時處理
+    :param file_path: 音訊檔案路徑
+    :param openai_client: 共用的 OpenAIClient（向量、摘要，以及預設的轉錄）
+    :param size: 已知的檔案大小（bytes），例如監控事件中已取得，可省去一次 stat
+    :param speech_client: 轉錄後端（例如 FasterWhisperClient），未提供時使用 openai_client
+    :return: 是否成功處理
+    """
+    local_backend = speech_client is not None and speech_client is not openai_client
+    global _process_semaphore
+    if _process_semaphore is None:
+        _process_semaphore = asyncio.Semaphore(PROCESS_CONCURRENCY)
         
-        # 生成摘要
-        logger.info("開始生成摘要，檔案：%s", file_path)
-        summary = openai_client.generate_summary(transcript, SUMMARY_PROMPT)
-        if not summary:
-            logger.error("生成摘要失敗")
-            return False
+    async with _process_semaphore:
+        try:
+            logger.info("開始處理檔案：%s", file_path)
             
-        # 儲存摘要
-        summary_path = os.path.join(SUMMARY_FOLDER, f"{file_name}_summary.txt")
-        with open(summary_path, "w", encoding="utf-8") as f:
-            f.write(summary)
-        logger.info("摘要已儲存至：%s", summary_path)
-        
-        logger.info("檔案處理完成")
-        return True
-        
-    except Exception as e:
-        logger.error("處理檔案時發生錯誤：%s", str(e))
-        return False
+            # 檢查檔案大小
+            file_size = size if size is not None else await _to_thread(os.path.getsize, file_path)
+            logger.info("檔案大小：%.2f MB", file_size / (1024 * 1024))
+            
+            # 本地轉錄沒有上傳大小限制
+            if file_size > MAX_FILE_SIZE and not local_backend:
+                logger.error("檔案太大：%.2f MB，超過限制", file_size / (1024 * 1024))
+                return False
+                
+            # 相同內容的檔案（搬移、複製、重新存檔）直接沿用先前的輸出
+            file_name = os.path.splitext(os.path.basename(file_path))[0]
+            # hashlib 計算大區塊時會釋放 GIL，於執行緒中即可與其他工作並行
+            file_hash = await _to_thread(hash_file, file_path)
+            cache_version = _file_cache_version(local_backend)
+            if await _to_thread(_restore_from_file_cache, file_hash, cache_version, file_name):
+                logger.info("檔案內容與先前處理過的檔案相同，已沿用既有逐字稿與摘要：%s", file_path)
+                return True
+                
+            # 轉錄音訊；本地模型為同步推論，於執行緒中執行；
+            # 串流模式下逐字稿隨音訊送出陸續回傳，收齊後即開始生成摘要
+            if local_backend:
+                transcript = await _to_thread(speech_client.transcribe_audio, file_path)
+            elif TRANSCRIBE_STREAMING:
+                transcript = await openai_client.atranscribe_audio_stream(file_path)
+            else:
+                transcript = await _transcribe_file(openai_client, file_path, file_hash)
+            if not transcript:
+                logger.error("轉錄失敗")
+                return False
+                
+            # 儲存逐字稿
+            transcript_path = os.path.join(OUTPUT_FOLDER, f"{file_name}_transcript.txt")
+            await _to_thread(_write_text, transcript_path, transcript)
+            logger.info("逐字稿已儲存至：%s", transcript_path)
+            
+            # 先查詢語意快取（已啟用時），相似度足夠時沿用既有摘要
+            embedding = await openai_client.aembed(transcript) if semantic_cache else None
+            cached_summary_path = await _to_thread(semantic_cache.lookup, embedding) if embedding else None
+            if cached_summary_path:
+                logger.info("沿用既有摘要：%s", cached_summary_path)
+                summary = await _to_thread(_read_text, cached_summary_path)
+            else:
+                # 生成摘要
+                logger.info("開始生成摘要，檔案：%s", file_path)
+                summary = await openai_client.agenerate_summary(transcript, SUMMARY_PROMPT)
+            # 逐字稿已寫入檔案，之後不再使用，先釋放以免與摘要同時佔用記憶體
+            del transcript
+            if not summary:
+                logger.error("生成摘要失敗")
+                return False
+                
+            # 儲存摘要
+            summary_path = os.path.join(SUMMARY_FOLDER, f"{file_name}_summary.txt")
+            await _to_thread(_write_text, summary_path, summary)
+            logger.info("摘要已儲存至：%s", summary_path)
+            # 快取保存輸出的副本，之後同名的新錄音覆寫輸出檔時不會影響既有的快取項目；
+            # 沿用自其他錄音的摘要不寫入檔案快取，以免借來的摘要永久綁定在本檔案上
+            if not cached_summary_path:
+                cached_copy = await _to_thread(_register_file_cache, file_hash, cache_version, transcript_path, summary_path)
+                if embedding:
+                    await _to_thread(semantic_cache.add, embedding, cached_copy)
+            
+            logger.info("檔案處理完成")
+            return True
+            
+        except Exception as e:
+            logger.error("處理檔案時發生錯誤：%s", str(e))
+            return False
 
-def start_file_monitoring():
-    """啟動檔案監控"""
+def start_file_monitoring(openai_client, speech_client=None):
+    """
+    啟動檔案監控
+    :param openai_client: 共用的 OpenAIClient
+    :param speech_client: 轉錄後端，未提供時使用 openai_client
+    """
     if not WATCH_FOLDER or not os.path.exists(WATCH_FOLDER):
         logger.warning("未設定監控資料夾或資料夾不存在")
         return None
@@ -183,7 +527,10 @@ def start_file_monitoring():
     try:
         # 建立觀察者
         observer = Observer()
-        event_handler = AudioFileHandler(process_file)
+        # Linux 的 inotify 觀察者會送出檔案關閉事件（IN_CLOSE_WRITE），可精確得知寫入完成的時間點
+        closed_events = Observer.__name__ == "InotifyObserver"
+        process_func = functools.partial(process_file_async, speech_client=speech_client)
+        event_handler = AudioFileHandler(openai_client, process_func, closed_events)
         observer.schedule(event_handler, WATCH_FOLDER, recursive=False)
         observer.start()
         logger.info("開始監控資料夾：%s", WATCH_FOLDER)
@@ -195,22 +542,37 @@ def start_file_monitoring():
 def main():
     """主程式"""
     try:
-        # 確保資料夾存在
-        ensure_folders()
+        # 啟動背景事件迴圈，檔案處理與 API 呼叫皆於其中並行執行
+        async_runner.get_loop()
         
         # 初始化 OpenAI 客戶端
-        openai_client = OpenAIClient()
+        # 所有檔案（監控與 GUI）共用同一個 API 限流器，每個實際送出的請求各自計入，突發大量檔案時預先節流，避免觸發 429
+        limiter = RateLimiter(MAX_CONCURRENT_REQUESTS, REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE)
+        openai_client = OpenAIClient(limiter=limiter)
         logger.info("OpenAI 客戶端初始化完成")
         
+        # 選擇轉錄後端
+        if SPEECH_BACKEND == "faster_whisper":
+            from faster_whisper_client import FasterWhisperClient
+            speech_client = FasterWhisperClient(summary_client=openai_client)
+            logger.info("使用本地轉錄後端（faster-whisper）")
+        else:
+            speech_client = openai_client
+        
         # 初始化音訊處理器
-        audio_processor = AudioProcessor()
+        audio_processor = AudioProcessor(speech_client=speech_client)
         logger.info("音訊處理器初始化完成")
         
         # 啟動檔案監控
-        observer = start_file_monitoring()
+        observer = start_file_monitoring(openai_client, speech_client)
         
         # 啟動 GUI
-        app = TranscriptionGUI(openai_client, audio_processor)
+        # 直接傳入處理函式：GUI 若自行 import transcribe，在以 __main__ 執行時會載入第二份模組，
+        # 連同限流器、快取等模組層級物件都不與監控共用
+        app = TranscriptionGUI(
+            openai_client, audio_processor,
+            functools.partial(process_file, speech_client=speech_client)
+        )
         
         try:
             app.mainloop()
@@ -224,6 +586,9 @@ def main():
     except Exception as e:
         logger.error("程式執行時發生錯誤：%s", str(e))
         sys.exit(1)
+    finally:
+        # 寫出佇列中剩餘的日誌
+        log_listener.stop()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
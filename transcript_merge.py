@@ -0,0 +1,40 @@
+def _boundary_overlap(tail, head, min_match, tolerance):
+    """
+    找出前段結尾與後段開頭重複的文字。重複處必須貼近前段結尾與後段開頭（各容許 tolerance 個字元的誤差，
+    對應切點附近被截斷的字），視窗內其他位置重複出現的詞句不算，以免刪去兩者之間的內容
+    :param tail: 前段結尾
+    :param head: 後段開頭
+    :return: (重複處在 tail 的起點, 重複處在 head 的起點)，找不到時回傳 None
+    """
+    for size in range(min(len(tail), len(head)), min_match - 1, -1):
+        for b in range(min(tolerance, len(head) - size) + 1):
+            # 只在 tail 的最後 size + tolerance 個字元內尋找
+            a = tail.rfind(head[b:b + size], max(len(tail) - size - tolerance, 0))
+            if a != -1:
+                return a, b
+    return None
+
+def merge_transcripts(texts, window=200, min_match=4, tolerance=10):
+    """
+    依序合併重疊片段的逐字稿，去除相鄰片段邊界上重複的文字
+    :param texts: 依時間排序的逐字稿列表
+    :param window: 比對重疊時，取前段結尾與後段開頭的字元數
+    :param min_match: 視為重疊的最短相同字元數
+    :param tolerance: 重複處與邊界之間容許的字元數
+    :return: 合併後的逐字稿
+    """
+    merged = ""
+    for text in texts:
+        text = text.strip()
+        if not merged:
+            merged = text
+            continue
+        tail = merged[-window:]
+        overlap = _boundary_overlap(tail, text[:window], min_match, tolerance)
+        if overlap:
+            # 保留前段至重複處開頭，後段從同一處接續
+            a, b = overlap
+            merged = merged[:len(merged) - len(tail) + a] + text[b:]
+        else:
+            merged = f"{merged} {text}"
+    return merged
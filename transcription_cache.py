@@ -0,0 +1,169 @@
+import os
+import math
+import hashlib
+import logging
+import sqlite3
+import threading
+from array import array
+from config import CACHE_FOLDER
+
+# 使用 root logger
+logger = logging.getLogger(__name__)
+logger.propagate = True
+
+def hash_file(file_path):
+    """
+    以固定大小的緩衝區串流計算檔案的 SHA-256，記憶體用量與檔案大小無關
+    :param file_path: 檔案路徑
+    :return: 十六進位雜湊字串
+    """
+    with open(file_path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        buf = bytearray(1 << 20)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+        return h.hexdigest()
+
+class TranscriptionCache:
+    """以內容雜湊為鍵的持久化快取（SQLite），避免重複呼叫 API"""
+
+    def __init__(self, cache_folder=None):
+        cache_folder = cache_folder or CACHE_FOLDER
+        os.makedirs(cache_folder, exist_ok=True)
+        self.db_path = os.path.join(cache_folder, "transcripts.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+        logger.info("(transcription_cache) 快取初始化完成：%s", self.db_path)
+
+    @staticmethod
+    def file_key(file_path, file_hash=None):
+        """
+        計算音訊檔案內容的雜湊值
+        :param file_path: 檔案路徑
+        :param file_hash: 已計算過的 hash_file 結果（可選，提供時不再讀取檔案）
+        :return: 雜湊字串
+        """
+        return "audio:" + (file_hash or hash_file(file_path))
+
+    @staticmethod
+    def text_key(*parts):
+        """
+        計算文字內容的雜湊值
+        :param parts: 參與雜湊的字串（如逐字稿、提示詞、模型名稱）
+        :return: 雜湊字串
+        """
+        h = hashlib.sha256()
+        for part in parts:
+            h.update((part or "").encode("utf-8"))
+            h.update(b"\0")
+        return "text:" + h.hexdigest()
+
+    def get(self, key):
+        """取得快取內容，未命中時回傳 None"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def set(self, key, value):
+        """寫入快取內容"""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)", (key, value))
+            self._conn.commit()
+
+    def stats(self):
+        """
+        取得快取命中統計
+        :return: {"hits": 命中次數, "misses": 未命中次數}
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+class SemanticSummaryCache:
+    """
+    以逐字稿向量的餘弦相似度查找既有摘要（SQLite 儲存、純 Python 比對，適用於小規模資料）。
+    以摘要提示詞的雜湊區分版本，修改提示詞後舊的項目不會被命中。
+    """
+
+    def __init__(self, version_key, threshold=0.92, cache_folder=None):
+        """
+        :param version_key: 版本鍵（如摘要提示詞與模型名稱）
+        :param threshold: 視為命中的最低餘弦相似度
+        """
+        cache_folder = cache_folder or CACHE_FOLDER
+        os.makedirs(cache_folder, exist_ok=True)
+        self.db_path = os.path.join(cache_folder, "summaries.sqlite3")
+        self.version = hashlib.sha256(version_key.encode("utf-8")).hexdigest()
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS semantic (version TEXT NOT NULL, embedding BLOB NOT NULL, summary_path TEXT NOT NULL)"
+            )
+            self._conn.commit()
+            rows = self._conn.execute(
+                "SELECT embedding, summary_path FROM semantic WHERE version = ?", (self.version,)
+            ).fetchall()
+        self._entries = []
+        for blob, summary_path in rows:
+            vector = array("f")
+            vector.frombytes(blob)
+            self._entries.append((vector, summary_path))
+        logger.info("(transcription_cache) 語意快取載入 %d 筆資料", len(self._entries))
+
+    @staticmethod
+    def _normalize(embedding):
+        """正規化為單位向量，之後以內積即可得到餘弦相似度"""
+        norm = math.sqrt(sum(x * x for x in embedding)) or 1.0
+        return array("f", (x / norm for x in embedding))
+
+    def lookup(self, embedding):
+        """
+        查找最相似的既有摘要
+        :param embedding: 逐字稿的向量
+        :return: 摘要檔案路徑，未命中時回傳 None
+        """
+        query = self._normalize(embedding)
+        best_score, best_path = 0.0, None
+        with self._lock:
+            entries = list(self._entries)
+        for vector, summary_path in entries:
+            if len(vector) != len(query):
+                continue
+            score = sum(a * b for a, b in zip(query, vector))
+            if score > best_score:
+                best_score, best_path = score, summary_path
+        if best_path and best_score >= self.threshold and os.path.exists(best_path):
+            logger.info("(transcription_cache) 語意快取命中（相似度 %.3f）：%s", best_score, best_path)
+            return best_path
+        return None
+
+    def add(self, embedding, summary_path):
+        """
+        新增一筆摘要
+        :param embedding: 逐字稿的向量
+        :param summary_path: 摘要檔案路徑
+        """
+        vector = self._normalize(embedding)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO semantic (version, embedding, summary_path) VALUES (?, ?, ?)",
+                (self.version, vector.tobytes(), summary_path)
+            )
+            self._conn.commit()
+            self._entries.append((vector, summary_path))